@@ -0,0 +1,175 @@
+"""
+Benchmarks for the ols_violations simulation hot paths.
+
+Times every error generator, batched fitter and full study over a grid of
+n_simulations x n_samples and records wall time, replicates per second and
+peak traced memory. Results are written as JSON so runs can be compared
+over time:
+
+    python benchmarks/bench_hot_paths.py --output bench.json
+    python benchmarks/bench_hot_paths.py --only fit_ --n-simulations 1000 100000
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from ols_violations.engines import fit_ols_batch, fit_wls_batch, generate_arma_errors
+from ols_violations.utils import SimulationParams
+from ols_violations.violations import AutocorrelationStudy, HomoscedasticityStudy
+from ols_violations.violations.autocorrelation import generate_ar1_errors, generate_iid_errors
+
+
+# Each benchmark maps (n_simulations, n_samples) to (setup, run): `setup()` builds
+# the inputs outside the timed region and `run(inputs)` is the measured call.
+
+def _params(n_simulations, n_samples):
+    return SimulationParams(
+        n_simulations=n_simulations, n_samples=n_samples, alpha=0.0, beta=0.0,
+        rho=0.95, sigma=0.25, seed=0,
+    )
+
+
+def bench_generate_ar1_errors(n_simulations, n_samples):
+    return lambda: _params(n_simulations, n_samples), generate_ar1_errors
+
+
+def bench_generate_iid_errors(n_simulations, n_samples):
+    return lambda: _params(n_simulations, n_samples), generate_iid_errors
+
+
+def bench_generate_arma_errors(n_simulations, n_samples):
+    def run(_):
+        generate_arma_errors(n_simulations, n_samples, ar=(0.5, 0.3), ma=(0.4,), rng=0)
+    return lambda: None, run
+
+
+def bench_fit_ols_batch(n_simulations, n_samples):
+    def setup():
+        xt = np.linspace(-1, 1, n_samples)
+        return xt, np.random.default_rng(0).normal(size=(n_simulations, n_samples))
+    return setup, lambda inputs: fit_ols_batch(*inputs).reject(0.05)
+
+
+def bench_fit_wls_batch(n_simulations, n_samples):
+    def setup():
+        rng = np.random.default_rng(0)
+        X = rng.uniform(1, 5, (n_simulations, n_samples))
+        Y = 2 * X + rng.normal(scale=0.5 * X)
+        return X, Y, 1 / (0.5 * X) ** 2
+    return setup, lambda inputs: fit_wls_batch(*inputs)
+
+
+def bench_autocorrelation_study(n_simulations, n_samples):
+    study = AutocorrelationStudy(n_simulations=n_simulations, n_samples=n_samples)
+    return lambda: None, lambda _: study.simulate(seed=0)
+
+
+def bench_autocorrelation_study_float32(n_simulations, n_samples):
+    study = AutocorrelationStudy(n_simulations=n_simulations, n_samples=n_samples, dtype=np.float32)
+    return lambda: None, lambda _: study.simulate(seed=0)
+
+
+def bench_autocorrelation_streaming(n_simulations, n_samples):
+    study = AutocorrelationStudy(n_simulations=n_simulations, n_samples=n_samples)
+    return lambda: None, lambda _: study.simulate_streaming(seed=0)
+
+
+def bench_homoscedasticity_study(n_simulations, n_samples):
+    study = HomoscedasticityStudy(n_simulations=n_simulations, n_samples=n_samples)
+    return lambda: None, lambda _: study.simulate(seed=0)
+
+
+BENCHMARKS = {
+    name[len("bench_"):]: fn
+    for name, fn in sorted(globals().items())
+    if name.startswith("bench_") and callable(fn)
+}
+
+
+def measure(benchmark, n_simulations, n_samples, repeat):
+    """Best-of-`repeat` wall time, then one traced run for the memory peak."""
+    setup, run = benchmark(n_simulations, n_samples)
+
+    times = []
+    for _ in range(repeat):
+        inputs = setup()
+        start = time.perf_counter()
+        run(inputs)
+        times.append(time.perf_counter() - start)
+
+    inputs = setup()
+    tracemalloc.start()
+    run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "n_simulations": n_simulations,
+        "n_samples": n_samples,
+        "seconds": best,
+        "seconds_all": times,
+        "replicates_per_sec": n_simulations / best if best > 0 else float("inf"),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-simulations", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--n-samples", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="Run only benchmarks whose name contains this string.")
+    parser.add_argument("--output", type=Path, default=Path("bench_hot_paths.json"))
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        if args.only not in name:
+            continue
+        for n_simulations in args.n_simulations:
+            for n_samples in args.n_samples:
+                row = {"benchmark": name, **measure(benchmark, n_simulations, n_samples, args.repeat)}
+                results.append(row)
+                print(
+                    f"{name:<32} n_sims={n_simulations:<8} n_samples={n_samples:<6} "
+                    f"{row['seconds'] * 1e3:10.2f} ms {row['replicates_per_sec']:14.0f} reps/s "
+                    f"{row['peak_memory_bytes'] / 2**20:9.1f} MiB"
+                )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Import-time benchmark and regression check for ols_violations.
+
+Imports each module in a fresh interpreter, records the import time and the
+heavy third-party packages it pulled in, and exits with status 1 if a
+numeric module loads any of them. Plotting, statsmodels and the scipy
+submodules must only be imported on first use.
+
+    python benchmarks/bench_imports.py --output imports.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parents[1] / "src"
+
+HEAVY = ("matplotlib", "statsmodels", "scipy", "tqdm", "sklearn")
+
+# Modules that must import with NumPy alone.
+NUMERIC_MODULES = (
+    "ols_violations",
+    "ols_violations.cache",
+    "ols_violations.engines",
+    "ols_violations.figures",
+    "ols_violations.parallel",
+    "ols_violations.precision",
+    "ols_violations.sweep",
+    "ols_violations.utils",
+    "ols_violations.violations",
+    "ols_violations.violations.autocorrelation",
+    "ols_violations.violations.dickey_fuller",
+    "ols_violations.violations.homoscedasticity",
+    "ols_violations.violations.multicollinearity",
+    "ols_violations.violations.weak_exogeneity",
+)
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def probe(module, repeat):
+    """Best-of-`repeat` import time of `module` in a fresh interpreter."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            capture_output=True, text=True, check=True, cwd=SRC,
+        ).stdout
+        runs.append(json.loads(out))
+    return {"module": module, "seconds": min(r["seconds"] for r in runs), "heavy": runs[0]["heavy"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = [probe(module, args.repeat) for module in NUMERIC_MODULES]
+    failures = [r for r in results if r["heavy"]]
+    for r in results:
+        status = "FAIL" if r["heavy"] else "ok"
+        print(f"{r['module']:<45} {r['seconds'] * 1e3:8.1f} ms  {status} {' '.join(r['heavy'])}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"Import benchmark saved: {args.output}")
+
+    if failures:
+        print(f"{len(failures)} module(s) eagerly import heavy dependencies.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
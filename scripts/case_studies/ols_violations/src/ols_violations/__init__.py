@@ -1,2 +1,17 @@
-import ols_violations.utils as utils
-import ols_violations.violations as violations
+import importlib
+
+# Submodules are imported on first attribute access, so importing the package
+# (or only its numeric parts) does not load matplotlib, statsmodels or scipy.
+_SUBMODULES = (
+    "cache", "engines", "figures", "instrumentation", "parallel", "precision", "sweep", "utils", "violations",
+)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+def _flatten(value, path=()):
+    """Yield (path, leaf) pairs for nested dicts of arrays and scalars."""
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _flatten(v, path + (k,))
+    else:
+        yield path, value
+
+
+def _unflatten(entries):
+    root = {}
+    for path, value in entries:
+        node = root
+        for k in path[:-1]:
+            node = node.setdefault(k, {})
+        node[path[-1]] = value
+    return root
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of simulation results.
+
+    Each entry is a directory named by the cache key holding one `.npy` file
+    per array and a `meta.json` with scalars and the nesting layout. Arrays
+    are reloaded with memory mapping, recarrays as recarray views. When the cache grows beyond `max_bytes`
+    the least recently used entries are removed.
+
+    Args:
+        root (str | Path): Cache directory.
+        max_bytes (int): Size cap of all entries together.
+    """
+
+    def __init__(self, root, max_bytes=4 * 2**30):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(study, seed):
+        """Stable hash of the study class, its VERSION tag, its parameters and the seed."""
+        cls = type(study)
+        payload = {
+            "study": f"{cls.__module__}.{cls.__qualname__}",
+            "version": getattr(study, "VERSION", None),
+            "params": study.params.content_hash(),
+            "seed": seed,
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def load(self, key):
+        """Return the cached results for `key`, or None on a miss."""
+        entry = self.root / key
+        meta_path = entry / "meta.json"
+        if not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        os.utime(meta_path)  # mark as recently used
+
+        entries = []
+        for item in meta["entries"]:
+            if "file" in item:
+                value = np.load(entry / item["file"], mmap_mode="r")
+                if item.get("kind") == "recarray":
+                    value = value.view(np.recarray)
+            else:
+                value = item["value"]
+            entries.append((item["path"], value))
+        return _unflatten(entries)
+
+    def store(self, key, results):
+        """Write `results` (nested dicts of arrays and scalars) under `key`."""
+        entry = self.root / key
+        if entry.exists():
+            return
+        tmp = Path(tempfile.mkdtemp(dir=self.root, prefix=".tmp-"))
+        items = []
+        for i, (path, value) in enumerate(_flatten(results)):
+            if isinstance(value, np.ndarray):
+                filename = f"{i}.npy"
+                np.save(tmp / filename, value)
+                item = {"path": list(path), "file": filename}
+                if isinstance(value, np.recarray):
+                    # np.save keeps the fields but not the attribute access
+                    item["kind"] = "recarray"
+                items.append(item)
+            else:
+                if isinstance(value, np.generic):
+                    value = value.item()
+                items.append({"path": list(path), "value": value})
+        with open(tmp / "meta.json", "w") as f:
+            json.dump({"entries": items}, f)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in self.root.iterdir():
+            meta_path = entry / "meta.json"
+            if entry.name.startswith(".") or not meta_path.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((meta_path.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -0,0 +1,15 @@
+from .accumulators import Histogram, RejectionCounter, RunningMoments, StreamingSummary
+from .arma import arma_filter, generate_arma_errors
+from .bootstrap import (
+    BootstrapResult, bootstrap_slope_distribution, bootstrap_slope_test, moving_block_indices,
+    resample_indices, stationary_indices,
+)
+from .design import Design, DesignCache, design_cache, get_design
+from .gram import condition_numbers, cross_products, solve_normal_equations, variance_inflation_factors
+from .hac import autocovariances, default_bandwidth, hac_slope_variance, kernel_weights
+from .inference import critical_values, reject, rejection_rates, two_sided_pvalues
+from .linear_model import LinearModel, linear_fit
+from .ols import BatchOLSResult, fit_ols_batch, fit_ols_noisy_predictor, fit_wls_batch
+from .sampling import normal, uniform
+from .store import create_replicate_store, fill_rows, iter_row_chunks, open_replicate_store
+from .unit_root import dickey_fuller_tau, simulate_random_walks
@@ -0,0 +1,238 @@
+import numpy as np
+
+
+class RunningMoments:
+    """
+    Streaming mean, variance and fourth moment (Welford/Chan update, with
+    Pébay's pairwise formulas for the higher central moments).
+
+    Chunks of values are folded in with `update`, and two accumulators built
+    on disjoint data can be combined with `merge`. The third and fourth central
+    sums `m3`, `m4` give the Monte Carlo standard error of the variance.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n_b = values.size
+        if n_b == 0:
+            return self
+        mean_b = values.mean()
+        dev = values - mean_b
+        dev2 = dev * dev
+        self._combine(n_b, mean_b, dev2.sum(), (dev2 * dev).sum(), (dev2 * dev2).sum())
+        return self
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.m3, other.m4)
+        return self
+
+    def _combine(self, n_b, mean_b, m2_b, m3_b, m4_b):
+        n_a = self.count
+        if n_a == 0:
+            self.count, self.mean, self.m2, self.m3, self.m4 = n_b, mean_b, m2_b, m3_b, m4_b
+            return
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        m2_a, m3_a = self.m2, self.m3
+        self.mean = self.mean + delta * n_b / n
+        self.m2 = m2_a + m2_b + delta**2 * n_a * n_b / n
+        self.m3 = (
+            m3_a + m3_b
+            + delta**3 * n_a * n_b * (n_a - n_b) / n**2
+            + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+        )
+        self.m4 = (
+            self.m4 + m4_b
+            + delta**4 * n_a * n_b * (n_a**2 - n_a * n_b + n_b**2) / n**3
+            + 6 * delta**2 * (n_a**2 * m2_b + n_b**2 * m2_a) / n**2
+            + 4 * delta * (n_a * m3_b - n_b * m3_a) / n
+        )
+        self.count = n
+
+    @property
+    def variance(self):
+        """Unbiased (ddof=1) sample variance."""
+        if self.count < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def mean_mcse(self):
+        """Monte Carlo standard error of the mean, std / sqrt(count)."""
+        return self.std / np.sqrt(self.count)
+
+    @property
+    def variance_mcse(self):
+        """
+        Monte Carlo standard error of the sample variance,
+        sqrt((mu_4 - sigma^4 (n - 3) / (n - 1)) / n) with the central moments
+        estimated from the accumulated sums.
+        """
+        n = self.count
+        if n < 4:
+            return np.nan
+        mu2 = self.m2 / n
+        mu4 = self.m4 / n
+        return np.sqrt(max(mu4 - mu2**2 * (n - 3) / (n - 1), 0.0) / n)
+
+
+class RejectionCounter:
+    """Counts how many replicates rejected the null hypothesis."""
+
+    def __init__(self):
+        self.count = 0
+        self.rejections = 0
+
+    def update(self, rejected):
+        rejected = np.asarray(rejected, dtype=bool)
+        self.count += rejected.size
+        self.rejections += int(np.count_nonzero(rejected))
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.rejections += other.rejections
+        return self
+
+    @property
+    def rate(self):
+        if self.count == 0:
+            return np.nan
+        return self.rejections / self.count
+
+    @property
+    def mcse(self):
+        """
+        Monte Carlo standard error of the rate, sqrt(p (1 - p) / count), with
+        p = (rejections + 1) / (count + 2) so that it does not vanish while no
+        (or every) replicate has rejected yet.
+        """
+        if self.count == 0:
+            return np.nan
+        p = (self.rejections + 1) / (self.count + 2)
+        return np.sqrt(p * (1 - p) / self.count)
+
+
+class Histogram:
+    """
+    Histogram with fixed bin edges that is filled one chunk at a time.
+
+    Values outside the edges are tallied in `underflow` and `overflow` so the
+    total count is always preserved. Binning follows `np.histogram`: bins are
+    half-open except the last, which includes the right edge.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(self.edges.size - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @classmethod
+    def linear(cls, low, high, n_bins):
+        """Histogram with `n_bins` equal-width bins spanning [low, high]."""
+        return cls(np.linspace(low, high, n_bins + 1))
+
+    @classmethod
+    def geometric(cls, low, high, n_bins):
+        """Histogram with `n_bins` log-spaced bins spanning [low, high], 0 < low < high."""
+        if not 0 < low < high:
+            raise ValueError(f"Geometric bins need 0 < low < high, got low={low}, high={high}.")
+        return cls(np.geomspace(low, high, n_bins + 1))
+
+    def update(self, values):
+        values = np.asarray(values).ravel()
+        counts, _ = np.histogram(values, self.edges)
+        self.counts += counts
+        self.underflow += int(np.count_nonzero(values < self.edges[0]))
+        self.overflow += int(np.count_nonzero(values > self.edges[-1]))
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges.")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def density(self, include_outliers=False):
+        """
+        Counts divided by bin width and the number of values.
+
+        By default the number of binned values is used, like `plt.hist(..., density=True)`.
+        With `include_outliers` it is `total`, so the density of the binned range
+        is that of the full sample, as when the full sample is histogrammed and
+        the plot is only cropped to the edges.
+        """
+        n = self.total if include_outliers else self.counts.sum()
+        return self.counts / n / np.diff(self.edges)
+
+    def quantile(self, q):
+        """
+        Approximate `q`-quantile(s) of all accumulated values, interpolating
+        linearly within the bin that contains them. Quantiles that fall among
+        the underflow or overflow values are nan.
+        """
+        target = np.asarray(q, dtype=np.float64) * self.total - self.underflow
+        cumulative = np.concatenate(([0], np.cumsum(self.counts)))
+        out = np.interp(target, cumulative, self.edges)
+        return np.where((target < 0) | (target > cumulative[-1]), np.nan, out)[()]
+
+
+class StreamingSummary:
+    """
+    Online summary of per-replicate simulation outputs.
+
+    Each chunk is a mapping from a quantity name to a 1-D array with one entry
+    per replicate. Boolean quantities are treated as test decisions and
+    counted with a `RejectionCounter`; numeric ones go into a
+    `RunningMoments` and, if edges were given for that name, a `Histogram`.
+
+    Args:
+        histogram_edges (dict): Optional mapping from quantity name to bin edges.
+    """
+
+    def __init__(self, histogram_edges=None):
+        self.histogram_edges = histogram_edges or {}
+        self.moments = {}
+        self.rejections = {}
+        self.histograms = {}
+
+    def update(self, chunk):
+        for name, values in chunk.items():
+            values = np.asarray(values)
+            if values.dtype == bool:
+                self.rejections.setdefault(name, RejectionCounter()).update(values)
+                continue
+            self.moments.setdefault(name, RunningMoments()).update(values)
+            if name in self.histogram_edges:
+                if name not in self.histograms:
+                    self.histograms[name] = Histogram(self.histogram_edges[name])
+                self.histograms[name].update(values)
+        return self
+
+    def merge(self, other):
+        for name, acc in other.moments.items():
+            self.moments.setdefault(name, RunningMoments()).merge(acc)
+        for name, acc in other.rejections.items():
+            self.rejections.setdefault(name, RejectionCounter()).merge(acc)
+        for name, acc in other.histograms.items():
+            self.histograms.setdefault(name, Histogram(acc.edges)).merge(acc)
+        return self
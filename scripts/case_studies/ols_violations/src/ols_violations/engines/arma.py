@@ -0,0 +1,81 @@
+import numpy as np
+
+from .sampling import normal
+
+
+def arma_filter(innovations, ar=(), ma=(), dtype=np.float64):
+    """
+    Apply the ARMA recursion to each row of `innovations`.
+
+    Computes e[t] = sum_k ar[k] * e[t-k-1] + u[t] + sum_k ma[k] * u[t-k-1]
+    with zero pre-sample values, as an IIR filter along the time axis. For a
+    pure AR(1) this reproduces the loop `e[t] = rho * e[t-1] + u[t]` exactly.
+
+    Args:
+        innovations (np.ndarray): Innovations u of shape (n_simulations, n_samples).
+        ar (sequence): Autoregressive coefficients (phi_1, ..., phi_p).
+        ma (sequence): Moving-average coefficients (theta_1, ..., theta_q).
+        dtype (np.dtype): Floating point type of the filter and its output.
+
+    Returns:
+        np.ndarray: Filtered errors with the same shape as `innovations`.
+    """
+    from scipy.signal import lfilter
+
+    b = np.concatenate(([1.0], np.asarray(ma, dtype=float))).astype(dtype)
+    a = np.concatenate(([1.0], -np.asarray(ar, dtype=float))).astype(dtype)
+    return lfilter(b, a, np.asarray(innovations, dtype=dtype), axis=-1)
+
+
+def generate_arma_errors(
+    n_simulations,
+    n_samples,
+    ar=(),
+    ma=(),
+    sigma=1.0,
+    rng=None,
+    stationary=False,
+    burn_in=0,
+    dtype=np.float64,
+):
+    """
+    Draw Gaussian ARMA(p, q) error series, one replicate per row.
+
+    By default the recursion starts from zero, as in the original AR(1) loop,
+    so early samples have a smaller variance than the stationary process.
+
+    Args:
+        n_simulations (int): Number of independent series.
+        n_samples (int): Length of each series.
+        ar (sequence): Autoregressive coefficients (phi_1, ..., phi_p).
+        ma (sequence): Moving-average coefficients (theta_1, ..., theta_q).
+        sigma (float): Standard deviation of the innovations.
+        rng (np.random.Generator | int | None): Random generator or seed.
+        stationary (bool): Start a pure AR(1) from its stationary distribution
+            by scaling the first innovation by 1 / sqrt(1 - rho^2). Other
+            models should use `burn_in` instead.
+        burn_in (int): Number of leading samples to simulate and discard.
+        dtype (np.dtype): np.float64 (default) or np.float32. The float64 path
+            draws exactly the same innovations as `rng.normal`.
+
+    Returns:
+        np.ndarray: Errors of shape (n_simulations, n_samples).
+    """
+    rng = np.random.default_rng(rng)
+    dtype = np.dtype(dtype)
+    size = (n_simulations, n_samples + burn_in)
+
+    u_t = normal(rng, scale=sigma, size=size, dtype=dtype)
+
+    if stationary:
+        if len(ar) != 1 or len(ma) != 0:
+            raise ValueError(
+                "stationary initialization is only available for AR(1); use burn_in instead."
+            )
+        rho = ar[0]
+        if abs(rho) >= 1:
+            raise ValueError(f"AR(1) with rho={rho} has no stationary distribution.")
+        u_t[:, 0] /= np.sqrt(1 - rho**2)
+
+    et = arma_filter(u_t, ar=ar, ma=ma, dtype=dtype)
+    return et[:, burn_in:]
@@ -0,0 +1,210 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .design import get_design
+
+METHODS = ("moving_block", "stationary")
+
+
+def default_block_length(n_samples):
+    """Block length of order n^(1/3), the usual rate for the variance of a sample mean."""
+    return max(1, int(round(n_samples ** (1 / 3))))
+
+
+def moving_block_indices(rng, shape, n_samples, block_length):
+    """
+    Index arrays of moving-block bootstrap resamples (Künsch).
+
+    Each resample concatenates blocks of `block_length` consecutive
+    observations starting at uniformly drawn positions in
+    [0, n_samples - block_length], truncated to `n_samples`.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        shape (tuple): Leading shape, e.g. (n_replicates, n_resamples).
+        n_samples (int): Length of each series.
+        block_length (int): Length of every block.
+
+    Returns:
+        np.ndarray: Integer indices of shape (*shape, n_samples).
+    """
+    shape = tuple(np.atleast_1d(shape))
+    block_length = min(int(block_length), n_samples)
+    n_blocks = -(-n_samples // block_length)
+    starts = rng.integers(0, n_samples - block_length + 1, size=shape + (n_blocks, 1), dtype=np.int32)
+    idx = starts + np.arange(block_length, dtype=np.int32)
+    return idx.reshape(shape + (n_blocks * block_length,))[..., :n_samples]
+
+
+def stationary_indices(rng, shape, n_samples, mean_block_length):
+    """
+    Index arrays of stationary bootstrap resamples (Politis and Romano).
+
+    Blocks start at uniform positions and wrap around the end of the series;
+    their lengths are geometric with mean `mean_block_length`, i.e. every
+    observation starts a new block with probability p = 1 / mean_block_length.
+
+    A block starting at a uniform position is the same as a uniform circular
+    shift of the time index, and shifting by the sum of independent uniform
+    increments is again uniform. So the indices are (t + cumsum(increments)) mod n,
+    with an increment drawn at every block start and zero elsewhere, and no
+    per-block gather is needed. One uniform u per observation decides both:
+    u < p starts a block, and then u / p is itself uniform.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        shape (tuple): Leading shape, e.g. (n_replicates, n_resamples).
+        n_samples (int): Length of each series.
+        mean_block_length (float): Expected block length, at least 1.
+
+    Returns:
+        np.ndarray: Integer indices of shape (*shape, n_samples).
+    """
+    shape = tuple(np.atleast_1d(shape))
+    # 32-bit types halve the memory traffic where they are exact: float32 steps
+    # need n / p below float32 resolution, and the int32 cumulative sum of up
+    # to n steps below n each must stay below 2^31
+    float_type = np.float32 if n_samples * mean_block_length < 2**23 else np.float64
+    int_type = np.int32 if n_samples**2 < 2**31 else np.int64
+
+    p = 1 / mean_block_length
+    u = rng.random(shape + (n_samples,), dtype=float_type)
+    steps = (u * float_type(n_samples / p)).astype(int_type)
+    steps[u >= float_type(p)] = 0
+    steps[..., 0] = (u[..., 0] * float_type(n_samples)).astype(int_type)
+    idx = np.cumsum(steps, axis=-1, dtype=int_type)
+    idx += np.arange(n_samples, dtype=int_type)
+    idx %= int_type(n_samples)
+    return idx
+
+
+def resample_indices(rng, shape, n_samples, method="stationary", block_length=None):
+    """Bootstrap index arrays of `method` ("moving_block" or "stationary"); see those functions."""
+    if block_length is None:
+        block_length = default_block_length(n_samples)
+    if method == "moving_block":
+        return moving_block_indices(rng, shape, n_samples, block_length)
+    if method == "stationary":
+        return stationary_indices(rng, shape, n_samples, block_length)
+    raise ValueError(f"Unknown method {method!r}; use one of {METHODS}.")
+
+
+def bootstrap_slope_distribution(xt, yt, n_resamples, rng=None, method="stationary", block_length=None):
+    """
+    Residual block-bootstrap distributions of the OLS slope for many replicates at once.
+
+    Each replicate is fitted once; its residuals are resampled in blocks, which
+    keeps their serial dependence, and added back to the fitted values. Under
+    the fixed design the refitted slope is beta + w'e*, with w the slope row of
+    the design's pseudo-inverse. Every resample is therefore one gather and one
+    dot product, done for all replicates and resamples as array operations.
+
+    Args:
+        xt (np.ndarray | Design): Shared predictor of shape (n_samples,).
+        yt (np.ndarray): Responses of shape (n_simulations, n_samples).
+        n_resamples (int): Bootstrap resamples per replicate.
+        rng (np.random.Generator | int | None): Random generator or seed.
+        method (str): "moving_block" or "stationary".
+        block_length (float): (Mean) block length; defaults to round(n^(1/3)).
+
+    Returns:
+        tuple: The slopes of shape (n_simulations,) and their bootstrap
+            replicates of shape (n_simulations, n_resamples). Memory grows with
+            n_simulations * n_resamples * n_samples; see `bootstrap_slope_test`
+            for a chunked summary.
+    """
+    design = get_design(xt)
+    rng = np.random.default_rng(rng)
+    yt = np.atleast_2d(yt)
+
+    coef = yt @ design.pinv_t
+    beta = coef[:, 1]
+    residuals = yt - coef[:, :1] - beta[:, None] * design.x
+
+    idx = resample_indices(rng, (yt.shape[0], n_resamples), design.n_samples, method, block_length)
+    resampled = np.take_along_axis(residuals[:, None, :], idx, axis=-1)
+    beta_star = beta[:, None] + resampled @ design.pinv_t[:, 1]
+    return beta, beta_star
+
+
+@dataclass
+class BootstrapResult:
+    """
+    Per-replicate summaries of bootstrap slope distributions.
+
+    Every array has shape (n_simulations,); `lower` and `upper` bound the
+    equal-tailed percentile interval at level 1 - `alpha`.
+    """
+    beta: np.ndarray
+    se: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    alpha: float
+    n_resamples: int
+
+    @property
+    def t_stat(self):
+        """t-statistics for beta = 0 with the bootstrap standard errors."""
+        return self.beta / self.se
+
+    def reject(self, null=0.0):
+        """Percentile-interval test decisions: the interval excludes `null`."""
+        return (self.lower > null) | (self.upper < null)
+
+
+def bootstrap_slope_test(
+    xt,
+    yt,
+    n_resamples=199,
+    alpha=0.05,
+    rng=None,
+    method="stationary",
+    block_length=None,
+    chunk_size=None,
+    max_bytes=2**28,
+):
+    """
+    Block-bootstrap standard errors and percentile intervals of the OLS slope.
+
+    Replicates are processed `chunk_size` at a time and only the summaries of
+    their bootstrap distributions are kept, so memory stays bounded for any
+    number of replicates; a memory-mapped `yt` is paged in chunk by chunk.
+
+    OLS residuals sum to zero, so their autocovariances over all lags do too,
+    and blocks of length L miss roughly a fraction (2L - 1) / n of the slope
+    variance even for white noise, as truncated HAC kernels do. Tests are
+    therefore somewhat liberal in short series.
+
+    Args:
+        xt (np.ndarray | Design): Shared predictor of shape (n_samples,).
+        yt (np.ndarray): Responses of shape (n_simulations, n_samples).
+        n_resamples (int): Bootstrap resamples per replicate.
+        alpha (float): Level of the percentile intervals.
+        rng (np.random.Generator | int | None): Random generator or seed.
+        method (str): "moving_block" or "stationary".
+        block_length (float): (Mean) block length; defaults to round(n^(1/3)).
+        chunk_size (int): Replicates per chunk. By default as many as fit the
+            resampled residuals and their indices into `max_bytes`.
+        max_bytes (int): Memory budget per chunk when `chunk_size` is None.
+
+    Returns:
+        BootstrapResult: Slopes, bootstrap standard errors and interval bounds.
+    """
+    design = get_design(xt)
+    rng = np.random.default_rng(rng)
+    yt = np.atleast_2d(yt)
+    if chunk_size is None:
+        # float64 resampled residuals plus their indices, with room to spare
+        chunk_size = max(1, max_bytes // (16 * n_resamples * design.n_samples))
+
+    parts = []
+    for start in range(0, yt.shape[0], chunk_size):
+        beta, beta_star = bootstrap_slope_distribution(
+            design, yt[start:start + chunk_size], n_resamples, rng, method, block_length
+        )
+        lower, upper = np.quantile(beta_star, [alpha / 2, 1 - alpha / 2], axis=1)
+        parts.append((beta, beta_star.std(axis=1, ddof=1), lower, upper))
+
+    beta, se, lower, upper = (np.concatenate(arrays) for arrays in zip(*parts))
+    return BootstrapResult(beta=beta, se=se, lower=lower, upper=upper, alpha=alpha, n_resamples=n_resamples)
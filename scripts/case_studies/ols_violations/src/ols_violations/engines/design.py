@@ -0,0 +1,106 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+class Design:
+    """
+    Precomputed quantities of the simple regression design X = [1, x].
+
+    Everything here depends on the predictor only, so it is computed once per
+    design and shared by every fit against it (see `get_design`).
+
+    Attributes:
+        x (np.ndarray): Predictor of shape (n_samples,), float64, read-only.
+        x_mean (float): Mean of the predictor.
+        xc (np.ndarray): Centered predictor.
+        ssx (float): Centered sum of squares xc'xc.
+        pinv_t (np.ndarray): Transposed pseudo-inverse of X, shape (n_samples, 2),
+            so that the (alpha, beta) estimates of every row of `yt` are `yt @ pinv_t`.
+        xtx_inv (np.ndarray): (X'X)^-1 of shape (2, 2).
+        leverages (np.ndarray): Diagonal of the hat matrix, 1/n + xc^2 / ssx.
+    """
+
+    def __init__(self, x):
+        x = np.array(x, dtype=np.float64)
+        n = x.shape[0]
+        self.x = x
+        self.x_mean = x.mean()
+        self.xc = x - self.x_mean
+        self.ssx = self.xc @ self.xc
+
+        # Closed form of (X'X)^-1 X' for X = [1, x]
+        beta_row = self.xc / self.ssx
+        alpha_row = 1 / n - self.x_mean * beta_row
+        self.pinv_t = np.column_stack([alpha_row, beta_row])
+        self.xtx_inv = np.array([
+            [1 / n + self.x_mean**2 / self.ssx, -self.x_mean / self.ssx],
+            [-self.x_mean / self.ssx, 1 / self.ssx],
+        ])
+        self.leverages = 1 / n + self.xc**2 / self.ssx
+
+        for array in (self.x, self.xc, self.pinv_t, self.xtx_inv, self.leverages):
+            array.flags.writeable = False
+
+    @property
+    def n_samples(self):
+        return self.x.shape[0]
+
+
+class DesignCache:
+    """
+    Bounded LRU cache of `Design` objects keyed by the content of the predictor.
+
+    Args:
+        maxsize (int): Number of designs kept; the least recently used one is
+            evicted beyond that.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._designs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(x):
+        """Hash of the predictor's values, shape and dtype."""
+        x = np.ascontiguousarray(x)
+        digest = hashlib.sha1(f"{x.dtype.str}{x.shape}".encode())
+        digest.update(x.tobytes())
+        return digest.hexdigest()
+
+    def get(self, x):
+        """The `Design` of predictor `x`, computed on a miss."""
+        key = self.key(x)
+        design = self._designs.get(key)
+        if design is not None:
+            self._designs.move_to_end(key)
+            self.hits += 1
+            return design
+
+        self.misses += 1
+        design = Design(x)
+        self._designs[key] = design
+        while len(self._designs) > self.maxsize:
+            self._designs.popitem(last=False)
+        return design
+
+    def clear(self):
+        self._designs.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._designs)
+
+
+# Per-process cache shared by every study and sweep point
+design_cache = DesignCache()
+
+
+def get_design(x):
+    """The cached `Design` of predictor `x`; see `DesignCache`."""
+    if isinstance(x, Design):
+        return x
+    return design_cache.get(np.asarray(x, dtype=np.float64))
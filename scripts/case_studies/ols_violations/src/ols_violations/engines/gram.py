@@ -0,0 +1,81 @@
+import numpy as np
+
+
+def cross_products(m):
+    """
+    Centered cross-product matrices of a stack of data matrices.
+
+    Args:
+        m (np.ndarray): Data of shape (n_simulations, n_samples, k), one replicate
+            per leading index, one variable per column.
+
+    Returns:
+        np.ndarray: Matrices Mc' Mc of shape (n_simulations, k, k), with Mc the
+            column-centered data, accumulated in float64.
+    """
+    m = np.asarray(m, dtype=np.float64)
+    mc = m - m.mean(axis=1, keepdims=True)
+    return np.matmul(mc.transpose(0, 2, 1), mc)
+
+
+def solve_normal_equations(gram, xty, yty):
+    """
+    Batched least squares from stacked normal equations, via Cholesky factors.
+
+    With G = L L' the solution is b = L^-T L^-1 X'y, the residual sum of squares
+    is y'y - |L^-1 X'y|^2 and the diagonal of G^-1 is the column sums of
+    (L^-1)^2, so one factorization and one inverse of its triangular factor per replicate
+    give the estimates, their variances and the VIFs.
+
+    Args:
+        gram (np.ndarray): Gram matrices X'X of shape (n_simulations, p, p).
+        xty (np.ndarray): Cross-products X'y of shape (n_simulations, p).
+        yty (np.ndarray): Sums of squares y'y of shape (n_simulations,).
+
+    Returns:
+        tuple: Arrays (beta, ssr, inv_diag) of shapes (n_simulations, p),
+            (n_simulations,) and (n_simulations, p), the last one the diagonal of G^-1.
+    """
+    lower = np.linalg.cholesky(gram)
+    lower_inv = np.linalg.inv(lower)
+    u = np.einsum("sij,sj->si", lower_inv, xty)
+    beta = np.einsum("sji,sj->si", lower_inv, u)
+    ssr = yty - np.einsum("si,si->s", u, u)
+    inv_diag = np.einsum("sij,sij->sj", lower_inv, lower_inv)
+    return beta, ssr, inv_diag
+
+
+def variance_inflation_factors(gram, inv_diag=None):
+    """
+    VIF of every predictor, VIF_j = (X'X)^-1_jj * (X'X)_jj for centered predictors.
+
+    Args:
+        gram (np.ndarray): Centered Gram matrices of shape (n_simulations, p, p).
+        inv_diag (np.ndarray): Diagonal of their inverses if already known, e.g.
+            from `solve_normal_equations`.
+
+    Returns:
+        np.ndarray: VIFs of shape (n_simulations, p).
+    """
+    if inv_diag is None:
+        inv_diag = np.diagonal(np.linalg.inv(gram), axis1=-2, axis2=-1)
+    return inv_diag * np.diagonal(gram, axis1=-2, axis2=-1)
+
+
+def condition_numbers(gram):
+    """
+    Condition numbers of the column-standardized design matrices.
+
+    The Gram matrices are scaled to correlation matrices R, and the condition
+    number of the design is sqrt(max eig(R) / min eig(R)).
+
+    Args:
+        gram (np.ndarray): Centered Gram matrices of shape (n_simulations, p, p).
+
+    Returns:
+        np.ndarray: Condition numbers of shape (n_simulations,).
+    """
+    scale = 1 / np.sqrt(np.diagonal(gram, axis1=-2, axis2=-1))
+    corr = gram * scale[:, :, None] * scale[:, None, :]
+    eig = np.linalg.eigvalsh(corr)
+    return np.sqrt(eig[:, -1] / eig[:, 0])
@@ -0,0 +1,150 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .design import get_design
+
+KERNELS = ("bartlett", "parzen", "quadratic_spectral")
+
+# Lag counts above which `autocovariances` switches to the FFT path by default
+_FFT_MIN_LAGS = 48
+
+
+def default_bandwidth(n_samples, kernel="bartlett"):
+    """
+    Newey and West's (1994) plug-in rate for the kernel bandwidth.
+
+    Bartlett: floor(4 (n/100)^(2/9)), which is also the statsmodels default
+    number of lags; Parzen: 4 (n/100)^(4/25); quadratic spectral: 4 (n/100)^(2/25).
+
+    Args:
+        n_samples (int): Length of each series.
+        kernel (str): One of `KERNELS`.
+
+    Returns:
+        float: The bandwidth.
+    """
+    rates = {"bartlett": 2 / 9, "parzen": 4 / 25, "quadratic_spectral": 2 / 25}
+    if kernel not in rates:
+        raise ValueError(f"Unknown kernel {kernel!r}; use one of {KERNELS}.")
+    bandwidth = 4 * (n_samples / 100) ** rates[kernel]
+    return float(np.floor(bandwidth)) if kernel == "bartlett" else bandwidth
+
+
+@lru_cache(maxsize=64)
+def _cached_kernel_weights(n_samples, kernel, bandwidth):
+    weights = kernel_weights(n_samples, kernel, bandwidth)
+    weights.flags.writeable = False
+    return weights
+
+
+def kernel_weights(n_samples, kernel="bartlett", bandwidth=None):
+    """
+    Lag weights w_0 = 1, w_1, ..., w_L of a HAC kernel.
+
+    Bartlett and Parzen weights vanish beyond the bandwidth (with the Newey-West
+    convention z = j / (bandwidth + 1), so a Bartlett bandwidth of L uses lags
+    1..L); the quadratic spectral kernel has unbounded support and weights all
+    lags up to n_samples - 1.
+
+    Args:
+        n_samples (int): Length of each series.
+        kernel (str): One of `KERNELS`.
+        bandwidth (float): Kernel bandwidth; defaults to `default_bandwidth`.
+
+    Returns:
+        np.ndarray: Weights for lags 0..L, without trailing zeros.
+    """
+    if bandwidth is None:
+        bandwidth = default_bandwidth(n_samples, kernel)
+    lags = np.arange(n_samples, dtype=float)
+
+    if kernel == "bartlett":
+        z = lags / (bandwidth + 1)
+        w = np.clip(1 - z, 0, None)
+    elif kernel == "parzen":
+        z = lags / (bandwidth + 1)
+        w = np.where(z <= 0.5, 1 - 6 * z**2 + 6 * z**3, 2 * np.clip(1 - z, 0, None) ** 3)
+    elif kernel == "quadratic_spectral":
+        a = 6 * np.pi * lags[1:] / (5 * bandwidth)
+        w = np.ones(n_samples)
+        w[1:] = 3 / a**2 * (np.sin(a) / a - np.cos(a))
+    else:
+        raise ValueError(f"Unknown kernel {kernel!r}; use one of {KERNELS}.")
+
+    support = np.flatnonzero(w)
+    return w[:support[-1] + 1]
+
+
+def autocovariances(u, max_lag, method="auto"):
+    """
+    Uncentered lagged cross-products gamma_j = sum_t u[t] u[t-j], row by row.
+
+    Args:
+        u (np.ndarray): Series of shape (n_simulations, n_samples).
+        max_lag (int): Highest lag j returned.
+        method (str): "direct" computes one dot product per lag, O(n L);
+            "fft" gets every lag at once from the power spectrum of the
+            zero-padded series, O(n log n); "auto" uses the FFT for more than
+            a few dozen lags.
+
+    Returns:
+        np.ndarray: Array of shape (n_simulations, max_lag + 1), in float64.
+    """
+    u = np.atleast_2d(u)
+    n_samples = u.shape[-1]
+    max_lag = min(max_lag, n_samples - 1)
+    if method == "auto":
+        method = "fft" if max_lag >= _FFT_MIN_LAGS else "direct"
+
+    if method == "direct":
+        gamma = np.empty((u.shape[0], max_lag + 1))
+        gamma[:, 0] = np.einsum("ij,ij->i", u, u, dtype=np.float64)
+        for j in range(1, max_lag + 1):
+            gamma[:, j] = np.einsum("ij,ij->i", u[:, j:], u[:, :-j], dtype=np.float64)
+        return gamma
+    if method == "fft":
+        # Padding to at least 2n - 1 turns the circular correlation into the linear one
+        n_fft = 1 << (2 * n_samples - 1).bit_length()
+        spectrum = np.fft.rfft(u.astype(np.float64, copy=False), n=n_fft, axis=-1)
+        power = spectrum.real**2 + spectrum.imag**2
+        return np.fft.irfft(power, n=n_fft, axis=-1)[:, :max_lag + 1]
+    raise ValueError(f"Unknown method {method!r}; use 'auto', 'direct' or 'fft'.")
+
+
+def hac_slope_variance(xt, residuals, kernel="bartlett", bandwidth=None, method="auto", df=None):
+    """
+    Newey-West (HAC) variance of the OLS slope for every replicate at once.
+
+    For a simple regression the slope depends on the data only through the
+    scores v_t = (x_t - mean(x)) e_t, so the sandwich estimator reduces to
+
+        Var(beta) = (sum_j w_j c_j gamma_j(v)) / ssx^2,
+
+    with c_0 = 1 and c_j = 2 for j > 0, the kernel weights w_j and the lagged
+    cross-products gamma_j of the scores, computed for the whole residual
+    matrix in one pass.
+
+    Args:
+        xt (np.ndarray | Design): Shared predictor of shape (n_samples,).
+        residuals (np.ndarray): OLS residuals of shape (n_simulations, n_samples).
+        kernel (str): One of `KERNELS`.
+        bandwidth (float): Kernel bandwidth; defaults to `default_bandwidth`.
+        method (str): How lagged cross-products are computed; see `autocovariances`.
+        df (int): If given, scale by n_samples / df, the small-sample correction
+            statsmodels applies with `use_correction=True`.
+
+    Returns:
+        np.ndarray: Slope variances of shape (n_simulations,).
+    """
+    design = get_design(xt)
+    n_samples = design.n_samples
+
+    w = _cached_kernel_weights(n_samples, kernel, bandwidth)
+    gamma = autocovariances(residuals * design.xc, len(w) - 1, method=method)
+    w = w[:gamma.shape[1]].copy()
+    w[1:] *= 2
+    beta_var = (gamma @ w) / design.ssx**2
+    if df is not None:
+        beta_var *= n_samples / df
+    return beta_var
@@ -0,0 +1,84 @@
+import numpy as np
+
+from .ols import fit_wls_batch
+
+
+def _as_predictor(x, y):
+    """Accept an sklearn-style single-feature column (n_samples, 1) for a single dataset."""
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 2 and x.shape[1] == 1 and np.ndim(y) == 1:
+        x = x[:, 0]
+    return x
+
+
+class LinearModel:
+    """
+    Least-squares line y = intercept + coef * x with the `fit`/`predict` surface
+    of sklearn's LinearRegression, for a single predictor.
+
+    Fits use closed-form weighted sufficient statistics (`fit_wls_batch`), so
+    many independent datasets can be fitted in one call: pass `y` of shape
+    (n_datasets, n_samples) with `x` either shared (n_samples,) or per dataset.
+    After fitting, `intercept_` and `coef_` are floats for a single dataset and
+    arrays of shape (n_datasets,) for a batch.
+
+    Args:
+        fit_intercept (bool): Whether to fit an intercept; otherwise the line
+            passes through the origin.
+    """
+
+    def __init__(self, fit_intercept=True):
+        self.fit_intercept = fit_intercept
+
+    def fit(self, x, y, sample_weight=None):
+        """
+        Fit the line to the data.
+
+        Args:
+            x (np.ndarray): Predictor of shape (n_samples,) or (n_samples, 1),
+                or (n_datasets, n_samples) for a batch.
+            y (np.ndarray): Response of shape (n_samples,) or (n_datasets, n_samples).
+            sample_weight (np.ndarray): Observation weights broadcastable to `y`.
+
+        Returns:
+            LinearModel: The fitted model itself.
+        """
+        x = _as_predictor(x, y)
+        y = np.asarray(y, dtype=float)
+        batched = y.ndim == 2
+
+        if self.fit_intercept:
+            intercept, coef = fit_wls_batch(x, y, weights=sample_weight)
+        else:
+            y2 = np.atleast_2d(y)
+            x2 = np.broadcast_to(x, y2.shape)
+            w = np.broadcast_to(1.0 if sample_weight is None else sample_weight, y2.shape)
+            coef = np.einsum("ij,ij,ij->i", w, x2, y2) / np.einsum("ij,ij,ij->i", w, x2, x2)
+            intercept = np.zeros_like(coef)
+
+        if batched:
+            self.intercept_, self.coef_ = intercept, coef
+        else:
+            self.intercept_, self.coef_ = float(intercept[0]), float(coef[0])
+        return self
+
+    def predict(self, x):
+        """
+        Evaluate the fitted line(s) at `x`.
+
+        For a batch of fits `x` may be shared (m,) or per dataset (n_datasets, m),
+        and the result has shape (n_datasets, m).
+        """
+        if np.ndim(self.coef_) == 0:
+            x = _as_predictor(x, np.empty(0))
+            return self.intercept_ + self.coef_ * x
+        x = np.asarray(x, dtype=float)
+        return self.intercept_[:, None] + self.coef_[:, None] * x
+
+
+def linear_fit(x, y, **kwargs):
+    """
+    Create a `LinearModel` and fit it on (x, y), passing keyword arguments such
+    as `sample_weight` to `LinearModel.fit`.
+    """
+    return LinearModel().fit(x, y, **kwargs)
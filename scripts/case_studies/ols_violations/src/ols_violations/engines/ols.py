@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .design import get_design
+from .hac import hac_slope_variance
+from .inference import reject, two_sided_pvalues
+
+# Rows fitted at a time: bounds the float64 residuals (and the upcast copy of
+# float32 responses) to a few MB and keeps them in cache
+_BLOCK_ROWS = 4096
+
+
+@dataclass
+class BatchOLSResult:
+    """
+    Per-replicate results of a batched simple linear regression.
+
+    Every array has shape (n_simulations,). `hac_beta_var` holds Newey-West
+    slope variances when the fit was asked for them, and is None otherwise.
+    """
+    alpha: np.ndarray
+    beta: np.ndarray
+    beta_var: np.ndarray
+    se: np.ndarray
+    t_stat: np.ndarray
+    df: int
+    hac_beta_var: np.ndarray = None
+
+    @property
+    def p_value(self):
+        """Two-sided p-values for beta = 0, evaluated on access."""
+        return two_sided_pvalues(self.t_stat, self.df)
+
+    def reject(self, alpha=0.05):
+        """Two-sided test decisions for beta = 0 at level(s) `alpha`; see `inference.reject`."""
+        return reject(self.t_stat, self.df, alpha)
+
+    @property
+    def hac_t_stat(self):
+        """t-statistics for beta = 0 with the HAC standard errors."""
+        if self.hac_beta_var is None:
+            raise ValueError("Fit with hac=... to get HAC standard errors.")
+        return self.beta / np.sqrt(self.hac_beta_var)
+
+    def reject_hac(self, alpha=0.05):
+        """Two-sided test decisions for beta = 0 with the HAC standard errors."""
+        return reject(self.hac_t_stat, self.df, alpha)
+
+
+def fit_ols_batch(xt, yt, df=None, chunk_size=None, hac=None):
+    """
+    Fit y = alpha + beta * x to every row of `yt` with vectorized block operations.
+
+    The predictor is shared by all replicates, so its pseudo-inverse and
+    centered sum of squares come from the design cache (see `get_design`),
+    and the intercepts and slopes of a whole chunk are one matrix product.
+    Residual sums of squares are summed from the residuals themselves rather
+    than expanded as y'y - b'X'y, which cancels catastrophically when the
+    mean of y is large relative to the noise.
+
+    Args:
+        xt (np.ndarray | Design): Shared predictor of shape (n_samples,).
+        yt (np.ndarray): Responses of shape (n_simulations, n_samples), one
+            replicate per row.
+        df (int): Residual degrees of freedom used for the variance estimate
+            and the t-test. Defaults to n_samples - 2.
+        chunk_size (int): If given, fit at most this many rows at a time, so a
+            memory-mapped `yt` is only paged in one chunk at a time. Rows are
+            fitted in blocks of at most a few thousand either way, so memory
+            beyond the results does not grow with the number of rows.
+        hac (dict): If given, also compute Newey-West slope variances from the
+            same residuals, with these keyword arguments (kernel, bandwidth,
+            method) for `hac_slope_variance`; an empty dict uses its defaults.
+
+    Returns:
+        BatchOLSResult: Intercepts, slopes, slope variances, standard errors,
+            t-statistics for beta = 0; p-values and test decisions are derived
+            from the t-statistics on demand.
+    """
+    design = get_design(xt)
+    yt = np.atleast_2d(yt)
+    if df is None:
+        df = design.n_samples - 2
+    block_rows = _BLOCK_ROWS if chunk_size is None else min(chunk_size, _BLOCK_ROWS)
+
+    n_rows = yt.shape[0]
+    alpha, beta, ssr = np.empty(n_rows), np.empty(n_rows), np.empty(n_rows)
+    hac_beta_var = None if hac is None else np.empty(n_rows)
+    for start in range(0, n_rows, block_rows):
+        rows = slice(start, start + block_rows)
+        # float32 responses are upcast one block at a time, so every product
+        # and reduction runs in float64 without a full-size float64 copy
+        y = yt[rows].astype(np.float64, copy=False)
+        coef = y @ design.pinv_t
+        alpha[rows], beta[rows] = coef[:, 0], coef[:, 1]
+
+        residuals = y - coef[:, :1]
+        residuals -= coef[:, 1:] * design.x
+        ssr[rows] = np.einsum("ij,ij->i", residuals, residuals)
+        if hac is not None:
+            hac_beta_var[rows] = hac_slope_variance(design, residuals, df=df, **hac)
+
+    beta_var = ssr / df / design.ssx
+    se = np.sqrt(beta_var)
+    t_stat = beta / se
+
+    return BatchOLSResult(
+        alpha=alpha,
+        beta=beta,
+        beta_var=beta_var,
+        se=se,
+        t_stat=t_stat,
+        df=df,
+        hac_beta_var=hac_beta_var,
+    )
+
+
+def fit_wls_batch(x, y, weights=None):
+    """
+    Fit y = alpha + beta * x by weighted least squares to every row at once.
+
+    Unlike `fit_ols_batch` each replicate may have its own predictor, so the
+    fit is carried out through weighted means and centered cross-products
+    row by row.
+
+    Args:
+        x (np.ndarray): Predictors of shape (n_simulations, n_samples), or a
+            shared predictor of shape (n_samples,).
+        y (np.ndarray): Responses of shape (n_simulations, n_samples).
+        weights (np.ndarray): Observation weights broadcastable to the shape
+            of `y`. Defaults to ordinary least squares (unit weights).
+
+    Returns:
+        tuple: Arrays (alpha, beta) of shape (n_simulations,).
+    """
+    y = np.atleast_2d(y)
+    x = np.broadcast_to(x, y.shape)
+    if weights is None:
+        weights = np.ones(y.shape[-1])
+    w = np.broadcast_to(weights, y.shape)
+
+    # Sums accumulate in float64 even when the inputs are float32
+    sw = w.sum(axis=1, dtype=np.float64)
+    x_mean = np.einsum("ij,ij->i", w, x, dtype=np.float64) / sw
+    y_mean = np.einsum("ij,ij->i", w, y, dtype=np.float64) / sw
+
+    xc = x - x_mean[:, None]
+    wxc = w * xc
+    beta = np.einsum("ij,ij->i", wxc, y - y_mean[:, None]) / np.einsum("ij,ij->i", wxc, xc)
+    alpha = y_mean - beta * x_mean
+
+    return alpha, beta
+
+
+def fit_ols_noisy_predictor(x, noise, y, scales):
+    """
+    OLS slopes of y on x + s * noise for every scale s in `scales`, per replicate.
+
+    The centered cross-products of x, noise and y are formed once per replicate,
+    and the slope for any s follows from them in closed form,
+
+        beta(s) = (Sxy + s * Szy) / (Sxx + 2 s * Sxz + s^2 * Szz),
+
+    so a whole grid of noise levels costs a single pass over the data.
+
+    Args:
+        x (np.ndarray): Predictors of shape (n_simulations, n_samples).
+        noise (np.ndarray): Predictor noise z of the same shape.
+        y (np.ndarray): Responses of the same shape.
+        scales (sequence): Noise scales s.
+
+    Returns:
+        np.ndarray: Slopes of shape (n_simulations, len(scales)).
+    """
+    x, noise, y = np.atleast_2d(x), np.atleast_2d(noise), np.atleast_2d(y)
+
+    def centered(a):
+        return a - a.mean(axis=1, keepdims=True, dtype=np.float64).astype(a.dtype)
+
+    def cross(a, b):
+        # Accumulate in float64 even when the inputs are float32
+        return np.einsum("ij,ij->i", a, b, dtype=np.float64)[:, None]
+
+    # Centering x and z suffices: sum(xc) == sum(zc) == 0
+    xc, zc = centered(x), centered(noise)
+    sxx, sxz, szz = cross(xc, xc), cross(xc, zc), cross(zc, zc)
+    sxy, szy = cross(xc, y), cross(zc, y)
+
+    s = np.asarray(scales, dtype=np.float64)[None, :]
+    return (sxy + s * szy) / (sxx + 2 * s * sxz + s**2 * szz)
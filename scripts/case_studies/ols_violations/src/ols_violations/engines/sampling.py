@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def normal(rng, scale=1.0, size=None, dtype=np.float64):
+    """
+    Draw N(0, scale^2) variates in `dtype`.
+
+    float64 draws are exactly `rng.normal(scale=scale, size=size)`. float32
+    draws come from the generator's native float32 sampler and are scaled in
+    float32, so no float64 temporary of the full size is created.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        scale (float | np.ndarray): Standard deviation, broadcastable to `size`.
+        size (tuple): Output shape; defaults to the shape of `scale`.
+        dtype (np.dtype): np.float64 or np.float32.
+    """
+    dtype = np.dtype(dtype)
+    if dtype == np.float64:
+        return rng.normal(scale=scale, size=size)
+    if size is None:
+        size = np.shape(scale)
+    out = rng.standard_normal(size=size, dtype=dtype)
+    out *= np.asarray(scale, dtype=dtype)
+    return out
+
+
+def uniform(rng, low=0.0, high=1.0, size=None, dtype=np.float64):
+    """Draw U(low, high) variates in `dtype`; float64 draws are exactly `rng.uniform`."""
+    dtype = np.dtype(dtype)
+    if dtype == np.float64:
+        return rng.uniform(low, high, size)
+    out = rng.random(size=size, dtype=dtype)
+    out *= dtype.type(high - low)
+    out += dtype.type(low)
+    return out
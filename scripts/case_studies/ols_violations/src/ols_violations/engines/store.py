@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import numpy as np
+
+
+def create_replicate_store(path, n_simulations, n_samples, dtype=np.float64):
+    """
+    Allocate a (n_simulations, n_samples) replicate matrix backed by a file.
+
+    The returned `np.memmap` behaves like an ndarray, but only the pages that
+    are being touched live in memory, so the matrix may be larger than RAM.
+
+    Args:
+        path (str | Path): File to create (overwritten if it exists).
+        n_simulations (int): Number of replicates (rows).
+        n_samples (int): Samples per replicate (columns).
+        dtype (np.dtype): Element type.
+
+    Returns:
+        np.memmap: Writable, zero-initialized replicate matrix.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return np.memmap(path, dtype=dtype, mode="w+", shape=(n_simulations, n_samples))
+
+
+def open_replicate_store(path, n_simulations, n_samples, dtype=np.float64):
+    """Open an existing replicate matrix written by `create_replicate_store`, read-only."""
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n_simulations, n_samples))
+
+
+def iter_row_chunks(n_rows, chunk_size):
+    """Yield (start, stop) bounds covering `n_rows` rows in chunks of at most `chunk_size`."""
+    for start in range(0, n_rows, chunk_size):
+        yield start, min(start + chunk_size, n_rows)
+
+
+def fill_rows(out, draw, chunk_size):
+    """
+    Fill the rows of `out` chunk by chunk with `draw(size)`.
+
+    Generators that draw row-major from a single `np.random.Generator`
+    produce the same values whether called once or in consecutive chunks,
+    so this reproduces `out[:] = draw(len(out))` without ever holding more
+    than `chunk_size` rows in memory.
+
+    Args:
+        out (np.ndarray): Destination of shape (n_simulations, n_samples), e.g. a memmap.
+        draw (callable): Maps a number of rows to an array of that many replicates.
+        chunk_size (int): Rows generated per call.
+
+    Returns:
+        np.ndarray: `out`.
+    """
+    for start, stop in iter_row_chunks(out.shape[0], chunk_size):
+        out[start:stop] = draw(stop - start)
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
@@ -0,0 +1,55 @@
+import numpy as np
+
+from .sampling import normal
+
+
+def simulate_random_walks(n_simulations, steps, x0=0.0, sigma=1.0, rng=None, dtype=np.float64):
+    """
+    Gaussian random walks x[t] = x[t-1] + u[t] started at `x0`, one per row.
+
+    The float64 path draws exactly the increments of `rng.normal`; float32
+    increments and paths are drawn and summed in float32.
+
+    Returns:
+        np.ndarray: Paths of shape (n_simulations, steps + 1) in `dtype`, including x0.
+    """
+    rng = np.random.default_rng(rng)
+    paths = np.empty((n_simulations, steps + 1), dtype=dtype)
+    paths[:, 0] = x0
+    increments = normal(rng, scale=sigma, size=(n_simulations, steps), dtype=dtype)
+    np.cumsum(increments, axis=1, out=paths[:, 1:])
+    paths[:, 1:] += x0
+    return paths
+
+
+def dickey_fuller_tau(paths):
+    """
+    Dickey-Fuller tau statistic of every path, fitted in closed form.
+
+    Regresses x[t] on x[t-1] without intercept, x[t] = phi * x[t-1] + e[t],
+    and returns tau = (phi_hat - 1) / se(phi_hat) with the usual OLS standard
+    error on steps - 1 degrees of freedom. This is the statistic obtained
+    from `sm.OLS(x[1:], x[:-1]).fit()` path by path.
+
+    float32 paths are not copied to float64: residuals are formed in the
+    paths' precision and every sum of products accumulates in float64.
+
+    Args:
+        paths (np.ndarray): Series of shape (n_simulations, steps + 1).
+
+    Returns:
+        np.ndarray: tau of shape (n_simulations,), in float64.
+    """
+    paths = np.atleast_2d(paths)
+    lagged = paths[:, :-1]
+    current = paths[:, 1:]
+    df = current.shape[1] - 1
+
+    sxx = np.einsum("ij,ij->i", lagged, lagged, dtype=np.float64)
+    phi = np.einsum("ij,ij->i", lagged, current, dtype=np.float64) / sxx
+
+    residuals = phi.astype(paths.dtype)[:, None] * lagged
+    np.subtract(current, residuals, out=residuals)
+    ssr = np.einsum("ij,ij->i", residuals, residuals, dtype=np.float64)
+    se = np.sqrt(ssr / df / sxx)
+    return (phi - 1) / se
@@ -0,0 +1,153 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from .parallel import parallel_map
+
+
+@dataclass(eq=False)
+class Figure:
+    """
+    Everything needed to render one figure file, independent of any study object.
+
+    Args:
+        path (str | Path): Output file; the format follows its suffix.
+        plot (callable): Module-level function drawing the figure with pyplot from `inputs`.
+        inputs (dict): Keyword arguments of `plot`: arrays, scalars and (nested) lists
+            or dicts of them. These are the simulation results the figure shows.
+        style (str): Matplotlib style applied before plotting, if installed.
+    """
+
+    path: Path
+    plot: callable
+    inputs: dict = field(default_factory=dict)
+    style: str = "axion"
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+
+    def content_hash(self):
+        """SHA-256 of the inputs, the style and the source of the plotting code."""
+        h = hashlib.sha256()
+        h.update(f"{self.plot.__module__}.{self.plot.__qualname__}|{self.style}|".encode())
+        h.update(_source(self.plot.__module__))
+        h.update(_source(f"{__package__}.utils.plot_utils"))
+        _update_hash(h, self.inputs)
+        return h.hexdigest()
+
+
+def _source(module_name):
+    """Source bytes of a module, so edits to any of its plotting helpers count."""
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    if path is None:
+        spec = importlib.util.find_spec(module_name)
+        path = spec.origin if spec is not None else None
+    if path is None or not os.path.isfile(path):
+        return module_name.encode()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _update_hash(h, value):
+    if isinstance(value, dict):
+        h.update(b"{")
+        for k in sorted(value, key=str):
+            h.update(repr(k).encode())
+            _update_hash(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for v in value:
+            _update_hash(h, v)
+        h.update(b"]")
+    elif isinstance(value, np.ndarray):
+        h.update(f"{value.dtype.str}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, "__dict__") and not callable(value):
+        # Accumulators such as Histogram: hash their state, not their identity
+        h.update(type(value).__qualname__.encode())
+        _update_hash(h, vars(value))
+    else:
+        if isinstance(value, np.generic):
+            value = value.item()
+        h.update(repr(value).encode())
+
+
+def render_figure(figure):
+    """
+    Draw and save one figure with the non-interactive Agg backend (worker entry point).
+
+    All pyplot state created here is closed again before returning.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from .utils.plot_utils import use_style
+
+    with plt.style.context("default"):
+        use_style(figure.style)
+        try:
+            figure.plot(**figure.inputs)
+            figure.path.parent.mkdir(parents=True, exist_ok=True)
+            plt.savefig(figure.path, bbox_inches="tight")
+        finally:
+            plt.close("all")
+    return str(figure.path)
+
+
+def build_figures(figures, manifest=None, max_workers=None, force=False):
+    """
+    Render figures in parallel, one process per figure, skipping unchanged ones.
+
+    A figure is up to date when its file exists and `manifest` records the same
+    `Figure.content_hash` for its path as now, i.e. neither its inputs nor its
+    plotting code changed since it was last written.
+
+    Args:
+        figures (sequence): `Figure` specifications.
+        manifest (str | Path): JSON file mapping figure paths to content hashes.
+            None renders every figure.
+        max_workers (int): Number of worker processes. Defaults to one per figure
+            to render, at most os.cpu_count().
+        force (bool): Render every figure even if it is up to date.
+
+    Returns:
+        list: Paths of the figures that were rendered.
+    """
+    recorded = {}
+    if manifest is not None and Path(manifest).exists():
+        with open(manifest) as f:
+            recorded = json.load(f)
+
+    hashes = {str(figure.path): figure.content_hash() for figure in figures}
+    stale = [
+        figure for figure in figures
+        if force
+        or not figure.path.exists()
+        or recorded.get(str(figure.path)) != hashes[str(figure.path)]
+    ]
+    for figure in figures:
+        if figure not in stale:
+            print(f"Figure up to date: {figure.path}")
+
+    if max_workers is None:
+        max_workers = min(len(stale), os.cpu_count() or 1) or 1
+    rendered = parallel_map(render_figure, stale, max_workers=max_workers)
+    for path in rendered:
+        print(f"Figure saved: {path}")
+
+    if manifest is not None:
+        recorded.update({path: hashes[path] for path in rendered})
+        manifest = Path(manifest)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = manifest.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(recorded, f, indent=2, sort_keys=True)
+        os.replace(tmp, manifest)
+    return rendered
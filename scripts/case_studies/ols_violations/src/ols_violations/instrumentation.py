@@ -0,0 +1,155 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Instrumentation:
+    """
+    Named timing spans with replicate counters and, optionally, memory peaks.
+
+    Spans nest: a span opened inside another is recorded under the path of
+    both, e.g. "simulate/fit". Every path accumulates its number of calls, wall
+    time and replicates processed; with `memory=True` also the highest traced
+    memory use above the level at which the span was entered (tracemalloc).
+    Tracing memory slows allocation-heavy code down many times over, so take
+    timings from runs without it.
+
+    Args:
+        memory (bool): Record per-span memory peaks with tracemalloc.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.spans = {}
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, replicates=None):
+        """
+        Time the body of the `with` block as span `name`.
+
+        Args:
+            name (str): Stage name, e.g. "generate_errors", "fit", "inference".
+            replicates (int): Number of Monte Carlo replicates the stage processes,
+                for the replicates/sec counter.
+        """
+        path = "/".join([frame["path"] for frame in self._stack[-1:]] + [name])
+        frame = {"path": path, "peak": 0}
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Keep the peak of the enclosing span before resetting it for this one
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], peak - parent["start"])
+            frame["start"] = current
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                frame["peak"] = max(frame["peak"], peak - frame["start"])
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["peak"] = max(parent["peak"], frame["peak"] + frame["start"] - parent["start"])
+            self._record(path, seconds, replicates, frame["peak"] if self.memory else None)
+
+    def _record(self, path, seconds, replicates, peak):
+        stats = self.spans.setdefault(
+            path, {"calls": 0, "seconds": 0.0, "replicates": 0, "peak_memory_bytes": None}
+        )
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["replicates"] += replicates or 0
+        if peak is not None:
+            stats["peak_memory_bytes"] = max(stats["peak_memory_bytes"] or 0, peak)
+
+    @contextmanager
+    def tracing(self):
+        """Run tracemalloc for the duration of the block if memory peaks are recorded."""
+        started = self.memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    def report(self):
+        """
+        Span statistics as a JSON-serializable dict.
+
+        Returns:
+            dict: Span path -> calls, seconds, replicates, replicates_per_sec and
+                peak_memory_bytes (None without memory tracing).
+        """
+        spans = {}
+        for path, stats in self.spans.items():
+            seconds = stats["seconds"]
+            replicates = stats["replicates"]
+            spans[path] = dict(
+                stats,
+                replicates_per_sec=replicates / seconds if replicates and seconds > 0 else None,
+            )
+        return spans
+
+
+@contextmanager
+def profiled(profiler=None, output=None):
+    """
+    Profile the block with cProfile or pyinstrument.
+
+    Args:
+        profiler (str): "cprofile", "pyinstrument" or None for no profiling.
+        output (str | Path): Where to write the profile: pstats data for cProfile
+            (view with `python -m pstats` or snakeviz), HTML for pyinstrument.
+
+    Yields:
+        dict: Filled with the profiler name and output path once the block exits.
+    """
+    info = {}
+    if profiler is None:
+        yield info
+        return
+
+    if profiler == "cprofile":
+        import cProfile
+        session = cProfile.Profile()
+        session.enable()
+        try:
+            yield info
+        finally:
+            session.disable()
+            if output is not None:
+                session.dump_stats(output)
+    elif profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError("profiler='pyinstrument' requires the pyinstrument package.") from e
+        session = Profiler()
+        session.start()
+        try:
+            yield info
+        finally:
+            session.stop()
+            if output is not None:
+                Path(output).write_text(session.output_html())
+    else:
+        raise ValueError(f"Unknown profiler {profiler!r}; use 'cprofile' or 'pyinstrument'.")
+    info.update(profiler=profiler, output=None if output is None else str(output))
+
+
+def write_report(report, path):
+    """Write an instrumentation report as indented JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .cache import ResultCache
+from .engines import StreamingSummary
+
+
+def parallel_map(fn, *iterables, max_workers=None):
+    """
+    Ordered `map` over a process pool.
+
+    Results are returned in input order, so anything reduced from them in that
+    order is independent of the number of workers. With `max_workers=1` the
+    calls run in the current process without starting a pool.
+
+    Args:
+        fn (callable): Picklable, module-level function.
+        *iterables: Argument iterables, as for the builtin `map`.
+        max_workers (int): Number of worker processes. Defaults to os.cpu_count().
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1:
+        return list(map(fn, *iterables))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fn, *iterables))
+
+
+def parallel_imap_unordered(fn, items, max_workers=None):
+    """
+    Yield (index, fn(item)) for every item of `items` as soon as its call completes.
+
+    Unlike `parallel_map`, finished results are available while the other calls
+    are still running, so callers can persist them one by one. With
+    `max_workers=1` the calls run lazily in the current process, in input order.
+
+    Args:
+        fn (callable): Picklable, module-level function of one argument.
+        items (iterable): Arguments of the calls.
+        max_workers (int): Number of worker processes. Defaults to os.cpu_count().
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1:
+        for index, item in enumerate(items):
+            yield index, fn(item)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(fn, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def simulate_chunk_summary(study, size, seed_seq):
+    """Simulate one streaming chunk of `study` and summarize it (worker entry point)."""
+    rng = np.random.default_rng(seed_seq)
+    summary = StreamingSummary(histogram_edges=study._histogram_edges())
+    return summary.update(study._simulate_chunk(rng, size))
+
+
+def run_study(study_cls, seed=None, render=True, cache_dir=None, manifest=None, **study_kwargs):
+    """
+    Instantiate, simulate and optionally render one study (worker entry point).
+
+    With `cache_dir` the simulation results are loaded from / stored in a
+    `ResultCache` there. `manifest` is passed on to `render_plots`.
+    """
+    study = study_cls(**study_kwargs)
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    study.simulate_cached(seed=seed, cache=cache)
+    if render:
+        study.render_plots(manifest=manifest)
+    return study
+
+
+def run_studies(study_classes, seed=None, render=True, cache_dir=None, manifest=None, max_workers=None):
+    """
+    Run independent studies in parallel, one process per study, then render
+    the figures of all studies in parallel, one process per figure.
+
+    Each study receives the same `seed` it would get when run on its own, so the
+    output does not depend on `max_workers`.
+
+    Args:
+        study_classes (sequence): `OLSViolationStudy` subclasses to run with default arguments.
+        seed (int): Seed passed to every `simulate` call.
+        render (bool): Whether to render the figures of every study.
+        cache_dir (str | Path): Optional `ResultCache` directory shared by the workers.
+        manifest (str | Path): Optional figure hash manifest; unchanged figures are
+            not rendered again (see `build_figures`).
+        max_workers (int): Number of worker processes. Defaults to os.cpu_count().
+
+    Returns:
+        list: The simulated study instances, in input order.
+    """
+    from .figures import build_figures
+
+    n = len(study_classes)
+    studies = parallel_map(
+        run_study,
+        study_classes,
+        [seed] * n,
+        [False] * n,
+        [cache_dir] * n,
+        max_workers=max_workers,
+    )
+    if render:
+        figures = [figure for study in studies for figure in study.figures()]
+        build_figures(figures, manifest=manifest, max_workers=max_workers)
+    return studies
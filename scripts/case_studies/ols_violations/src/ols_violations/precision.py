@@ -0,0 +1,104 @@
+import numpy as np
+
+from .engines import StreamingSummary
+
+
+class _RoundedDrawGenerator(np.random.Generator):
+    """
+    Generator whose reduced-precision draws are its float64 draws rounded.
+
+    `engines.sampling` draws float32 variates with the generator's native
+    float32 samplers, which consume a different stream than the float64 ones.
+    With this generator a float32 study instead sees the innovations of its
+    float64 counterpart, rounded to float32, so the two runs can be compared
+    replicate by replicate.
+    """
+
+    def standard_normal(self, size=None, dtype=np.float64, out=None):
+        return super().standard_normal(size).astype(dtype, copy=False)
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        return super().random(size).astype(dtype, copy=False)
+
+
+def compare_precision(
+    study_cls,
+    seed=None,
+    dtype=np.float32,
+    chunk_size=10000,
+    value_tol=1e-4,
+    decision_tol=1e-4,
+    z=4.0,
+    **study_kwargs,
+):
+    """
+    Validate a reduced-precision study against its float64 counterpart.
+
+    Both studies simulate the same streaming chunks from the same innovations:
+    the float64 study draws them, the reduced one gets them rounded to `dtype`
+    (see `_RoundedDrawGenerator`). Every per-replicate quantity returned by
+    `_simulate_chunk` is then compared replicate by replicate. Numeric
+    quantities (slopes, variances, t-statistics) pass when their largest
+    difference is within `value_tol` standard deviations of the float64
+    values. Test decisions pass when at most a fraction `decision_tol` of the
+    replicates decide differently, which can only happen for statistics
+    within rounding error of the critical value.
+
+    As a secondary check, the rejection rates and variances of both runs must
+    agree within `z` combined Monte Carlo standard errors (binomial for rates,
+    normal-theory for variances).
+
+    Args:
+        study_cls (type): `OLSViolationStudy` subclass supporting streaming mode.
+        seed (int): Seed of the shared innovations.
+        dtype (np.dtype): Reduced precision to validate.
+        chunk_size (int): Replicates per chunk.
+        value_tol (float): Tolerance for numeric quantities, in float64 standard deviations.
+        decision_tol (float): Tolerated fraction of differing test decisions.
+        z (float): Tolerance of the secondary check in standard errors.
+        **study_kwargs: Forwarded to `study_cls`.
+
+    Returns:
+        np.recarray: One row per quantity with the float64 and the reduced
+            precision rate or variance, the standard error of their difference,
+            the per-replicate discrepancy (`max_diff` in standard deviations for
+            numeric quantities, the fraction of differing decisions for tests)
+            and `ok` when both checks pass.
+    """
+    reference_study = study_cls(dtype=np.float64, **study_kwargs)
+    reduced_study = study_cls(dtype=dtype, **study_kwargs)
+    reference, reduced = StreamingSummary(), StreamingSummary()
+    max_diff, mismatches = {}, {}
+
+    for size, chunk_seed in reference_study._chunk_plan(seed, chunk_size):
+        ref_chunk = reference_study._simulate_chunk(np.random.default_rng(chunk_seed), size)
+        low_chunk = reduced_study._simulate_chunk(_RoundedDrawGenerator(np.random.PCG64(chunk_seed)), size)
+        reference.update(ref_chunk)
+        reduced.update(low_chunk)
+        for name, ref in ref_chunk.items():
+            ref, low = np.asarray(ref), np.asarray(low_chunk[name])
+            if ref.dtype == bool:
+                mismatches[name] = mismatches.get(name, 0) + int(np.count_nonzero(ref != low))
+            else:
+                diff = np.max(np.abs(low.astype(np.float64) - ref), initial=0.0)
+                max_diff[name] = max(max_diff.get(name, 0.0), diff)
+
+    records = []
+    for name, ref in reference.rejections.items():
+        low = reduced.rejections[name]
+        pooled = (ref.rejections + low.rejections) / (ref.count + low.count)
+        se = np.sqrt(pooled * (1 - pooled) * (1 / ref.count + 1 / low.count))
+        share = mismatches[name] / ref.count
+        ok = share <= decision_tol and abs(ref.rate - low.rate) <= z * se
+        records.append((f"{name}:rate", ref.rate, low.rate, se, share, bool(ok)))
+
+    for name, ref in reference.moments.items():
+        low = reduced.moments[name]
+        se = np.sqrt(
+            2 * ref.variance**2 / (ref.count - 1) + 2 * low.variance**2 / (low.count - 1)
+        )
+        scaled = max_diff[name] / ref.std
+        ok = scaled <= value_tol and abs(ref.variance - low.variance) <= z * se
+        records.append((f"{name}:variance", ref.variance, low.variance, se, scaled, bool(ok)))
+
+    return np.rec.fromrecords(records, names=["quantity", "float64", "reduced", "se", "max_diff", "ok"])
@@ -0,0 +1,172 @@
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+
+from .engines import fit_ols_batch
+from .parallel import parallel_imap_unordered
+from .utils import SimulationParams
+from .violations.autocorrelation import generate_ar1_errors
+
+
+def params_key(params: SimulationParams, point_fn=None):
+    """
+    Deterministic string key identifying a grid point (and the function evaluating it).
+
+    A point function can set a `version` attribute, bumped when a change alters
+    its results, so rows cached by earlier versions are not reused.
+    """
+    key = params.content_hash()
+    if point_fn is not None:
+        name = f"{point_fn.__module__}.{point_fn.__qualname__}"
+        version = getattr(point_fn, "version", None)
+        if version is not None:
+            name = f"{name}@{version}"
+        key = f"{name}:{key}"
+    return key
+
+
+def autocorrelation_point(params: SimulationParams):
+    """
+    Size of the OLS t-test under AR(1) errors at one grid point.
+
+    Simulates `params.n_simulations` AR(1) error series of length
+    `params.n_samples` with coefficient `params.rho` and innovation scale
+    `params.sigma`, and fits them all with `fit_ols_batch` on n_samples - 1
+    degrees of freedom, as `AutocorrelationStudy` does.
+
+    Returns:
+        dict: Grid point parameters plus
+            - false_positive_rate: share of 5% two-sided t-tests rejecting beta = 0.
+            - mean_beta_var: average OLS estimate of Var(beta_hat).
+            - empirical_beta_var: sample variance of beta_hat across replicates.
+    """
+    xt = np.linspace(-1.0, 1.0, params.n_samples)
+    yt = params.alpha + params.beta * xt + generate_ar1_errors(params)
+    fit = fit_ols_batch(xt, yt, df=params.n_samples - 1)
+
+    row = dict(params)
+    row.update(
+        false_positive_rate=float(np.mean(fit.reject(0.05))),
+        mean_beta_var=float(fit.beta_var.mean()),
+        empirical_beta_var=float(np.var(fit.beta, ddof=1)),
+    )
+    return row
+
+
+# Version 2 fits on n_samples - 1 degrees of freedom, like the study
+autocorrelation_point.version = 2
+
+
+def adaptive_autocorrelation_point(params: SimulationParams):
+    """
+    Like `autocorrelation_point`, but with as many replicates as the grid point needs.
+
+    Runs `AutocorrelationStudy.simulate_adaptive` until the false positive rates
+    (naive and HAC) and the slope variance under AR(1) errors are within
+    tolerance, with `params.n_simulations` as the replicate budget. Optional
+    extra parameters `rate_tol`, `var_rtol` and `chunk_size` tune the stopping
+    rule; they are part of the grid point, hence of its cache key.
+
+    Returns:
+        dict: Grid point parameters plus the false positive rates of the naive
+            and HAC tests under AR(1) errors and of the naive test under IID
+            errors of the same variance, the mean estimated and the empirical
+            slope variance, the replicates used and whether every target converged.
+    """
+    from .violations import AutocorrelationStudy
+
+    study = AutocorrelationStudy(
+        rho_vals=(params.rho,),
+        sigma=params.sigma,
+        n_simulations=params.n_simulations,
+        n_samples=params.n_samples,
+        dtype=params.dtype,
+    )
+    rate_tol = getattr(params, "rate_tol", 0.0025)
+    var_rtol = getattr(params, "var_rtol", 0.02)
+    targets = {
+        name: target
+        for name, target in study._adaptive_targets(rate_tol, var_rtol).items()
+        if name.endswith("_ar1")
+    }
+    summary = study.simulate_adaptive(
+        seed=params.seed, targets=targets, chunk_size=getattr(params, "chunk_size", 10000)
+    )
+
+    prefix = f"{study.rho_vals[0]}/"
+    row = dict(params)
+    row.update(
+        false_positive_rate=summary.rejections[prefix + "reject_ar1"].rate,
+        false_positive_rate_hac=summary.rejections[prefix + "reject_hac_ar1"].rate,
+        false_positive_rate_iid=summary.rejections[prefix + "reject_iid"].rate,
+        mean_beta_var=float(summary.moments[prefix + "beta_var_ar1"].mean),
+        empirical_beta_var=float(summary.moments[prefix + "beta_ar1"].variance),
+        n_simulations_used=study.stopping["n_simulations"],
+        converged=study.stopping["converged"],
+    )
+    return row
+
+
+def run_sweep(grid, point_fn=autocorrelation_point, cache_path=None, max_workers=1):
+    """
+    Evaluate `point_fn` on every point of `grid`, skipping points computed before.
+
+    Every newly computed row is appended to `cache_path` (JSON lines) and flushed
+    as soon as its point completes, so rerunning an interrupted sweep or an
+    extended grid only evaluates the missing points.
+
+    Args:
+        grid (sequence): SimulationParams, e.g. from `parameter_grid`.
+        point_fn (callable): Picklable function mapping SimulationParams to a flat dict row.
+        cache_path (str | Path): Optional JSON lines file of computed rows.
+        max_workers (int): Number of worker processes; None uses every core.
+
+    Returns:
+        np.recarray: One record per grid point, in grid order.
+    """
+    grid = list(grid)
+    if not grid:
+        raise ValueError("run_sweep needs at least one grid point.")
+
+    done = {}
+    last_line = "\n"
+    if cache_path is not None:
+        cache_path = Path(cache_path)
+        if cache_path.exists():
+            with open(cache_path) as f:
+                for last_line in f:
+                    try:
+                        entry = json.loads(last_line)
+                    except json.JSONDecodeError:
+                        # A row cut off by an interrupted run; its point is recomputed
+                        continue
+                    done[entry["key"]] = entry["row"]
+
+    keys = [params_key(params, point_fn) for params in grid]
+    todo = {}
+    for key, params in zip(keys, grid):
+        if key not in done:
+            todo.setdefault(key, params)
+
+    sink = nullcontext()
+    if cache_path is not None and todo:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        sink = open(cache_path, "a")
+        if not last_line.endswith("\n"):
+            # Start after a row cut off by an interrupted run
+            sink.write("\n")
+
+    todo_keys = list(todo)
+    with sink as f:
+        for index, row in parallel_imap_unordered(point_fn, list(todo.values()), max_workers=max_workers):
+            key = todo_keys[index]
+            done[key] = row
+            if f is not None:
+                f.write(json.dumps({"key": key, "row": row}, default=str) + "\n")
+                f.flush()
+
+    table = [done[key] for key in keys]
+    names = list(table[0])
+    return np.rec.fromrecords([tuple(row[name] for name in names) for row in table], names=names)
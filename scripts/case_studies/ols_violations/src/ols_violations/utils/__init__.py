@@ -1,2 +1,11 @@
-from .plot_utils import *
-from .utils import *
\ No newline at end of file
+import importlib
+
+from .utils import *
+
+
+def __getattr__(name):
+    # Plotting helpers load matplotlib, so they are imported on first use only.
+    plot_utils = importlib.import_module(f"{__name__}.plot_utils")
+    if not name.startswith("_") and hasattr(plot_utils, name):
+        return getattr(plot_utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
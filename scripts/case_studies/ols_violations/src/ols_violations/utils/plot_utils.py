@@ -1,14 +1,36 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from ..engines import Histogram
+
+def use_style(name="axion"):
+    "Apply a matplotlib style if it is installed."
+    if name in plt.style.available:
+        plt.style.use(name)
+
 def _default_kwargs(dict):
     if dict:
         return dict
     else:
         return {}
 
+def plot_hist(data, bins=50, density=False, ax=None, **kwargs):
+    """
+    Plot a histogram of an array, or of a pre-binned `Histogram` accumulator.
+
+    An accumulator is drawn with its own edges (`bins` is ignored) and without
+    access to the raw values. With `density=True` its counts are normalized by
+    all accumulated values, including those outside the edges.
+    """
+    if ax is None:
+        ax = plt.gca()
+    if isinstance(data, Histogram):
+        weights = data.density(include_outliers=True) if density else data.counts
+        return ax.hist(data.edges[:-1], data.edges, weights=weights, **kwargs)
+    return ax.hist(data, bins, density=density, **kwargs)
+
 def plot_distribution(data, true_value, xlabel, title, label, color):
-    plt.hist(data, bins=50, alpha=0.6, density=True, label=label, color=color)
+    plot_hist(data, bins=50, alpha=0.6, density=True, label=label, color=color)
     if true_value:
         plt.axvline(true_value, color='red', linestyle='dashed', linewidth=2, label=f"True {xlabel}")
     plt.xlabel(xlabel)
@@ -53,8 +75,15 @@ def plot_residuals(x, residuals):
     plt.axhline(0, color='red', linestyle='dashed', linewidth=2, label="Zero residual line")
     plt.legend()
 
-def plot_loghist(x, n : int, **kwargs):
-    "Plot a histogram of x where x is binned in a logspace."
+def plot_loghist(x, n : int = 50, **kwargs):
+    """
+    Plot a histogram of x where x is binned in a logspace.
+
+    x may also be a `Histogram` accumulator (e.g. `Histogram.geometric`), which
+    is drawn with its own edges.
+    """
+    if isinstance(x, Histogram):
+        return plot_hist(x, **kwargs)
     x = np.array(x).flatten()
     bins = np.geomspace(max(x.min(), 1e-13), max(x.max(), 1e-13), n)
     _ = plt.hist(x, bins, **kwargs)
@@ -1,19 +1,154 @@
-from dataclasses import dataclass
+import hashlib
+import json
+from itertools import product
+
+import numpy as np
+
+
+def _freeze(value):
+    """Turn lists (and nested lists) into tuples so parameter values are hashable."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _restore(values, extra):
+    params = SimulationParams.__new__(SimulationParams)
+    for name, value in zip(SimulationParams._fields, values):
+        object.__setattr__(params, name, value)
+    object.__setattr__(params, "extra", extra)
+    object.__setattr__(params, "_hash", None)
+    return params
+
 
-# @dataclass
 class SimulationParams:
-    # n_sims: int
-    # n_samples: int
-    # beta: float
-    # alpha: float
-    # rho: float
-    # sigma : float
+    """
+    Immutable parameters of a Monte Carlo simulation.
+
+    Instances are slotted (no per-instance dict), hashable, cheap to pickle and
+    have a stable `content_hash` suitable as a cache key. Use `replace` to
+    derive variants. Study-specific parameters beyond the typed fields are
+    accepted as keyword arguments and kept, sorted by name, in `extra`;
+    they are readable as attributes too.
+
+    Args:
+        n_simulations (int): Number of Monte Carlo replicates.
+        n_samples (int): Number of samples per replicate.
+        alpha (float): True intercept.
+        beta (float): True slope.
+        rho (float): Autoregressive coefficient of the errors, |rho| <= 1.
+        sigma (float): Standard deviation of the error innovations.
+        seed (int | None): Seed of the random generator; None draws fresh entropy.
+        dtype (str): "float64" or "float32", precision of the simulated data.
+        **extra: Additional study-specific parameters.
+    """
+
+    _fields = ("n_simulations", "n_samples", "alpha", "beta", "rho", "sigma", "seed", "dtype")
+    __slots__ = _fields + ("extra", "_hash")
+
+    def __init__(
+        self,
+        n_simulations: int = 1,
+        n_samples: int = 100,
+        alpha: float = 0.0,
+        beta: float = 0.0,
+        rho: float = 0.0,
+        sigma: float = 1.0,
+        seed=None,
+        dtype: str = "float64",
+        **extra,
+    ):
+        if int(n_simulations) != n_simulations or n_simulations < 1:
+            raise ValueError(f"n_simulations must be a positive integer, got {n_simulations!r}.")
+        if int(n_samples) != n_samples or n_samples < 2:
+            raise ValueError(f"n_samples must be an integer >= 2, got {n_samples!r}.")
+        if not abs(rho) <= 1:
+            raise ValueError(f"rho must lie in [-1, 1], got {rho!r}.")
+        if not sigma >= 0:
+            raise ValueError(f"sigma must be non-negative, got {sigma!r}.")
+        if dtype not in ("float64", "float32"):
+            dtype = np.dtype(dtype).name
+        if dtype not in ("float64", "float32"):
+            raise ValueError(f"dtype must be 'float64' or 'float32', got {dtype!r}.")
+
+        values = (
+            int(n_simulations),
+            int(n_samples),
+            float(alpha),
+            float(beta),
+            float(rho),
+            float(sigma),
+            None if seed is None else int(seed),
+            dtype,
+        )
+        for name, value in zip(self._fields, values):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "extra", tuple(sorted((k, _freeze(v)) for k, v in extra.items())))
+        object.__setattr__(self, "_hash", None)
 
-    def __init__(self, **kwargs):
+    def __getattr__(self, name):
+        # Only reached for names that are not slots: look them up in `extra`.
+        if name != "extra":
+            for key, value in self.extra:
+                if key == name:
+                    return value
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
-        for (k, v) in kwargs.items():
-            self.__setattr__(k, v)
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            f"{type(self).__name__} is immutable; use params.replace({name}=...) instead."
+        )
 
     def __iter__(self):
-        for k, v in self.__dict__.items():
-            yield k, v
+        for name in self._fields:
+            yield name, getattr(self, name)
+        yield from self.extra
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __reduce__(self):
+        return _restore, (self._values(), self.extra)
+
+    def __eq__(self, other):
+        if not isinstance(other, SimulationParams):
+            return NotImplemented
+        return self._values() == other._values() and self.extra == other.extra
+
+    def __hash__(self):
+        return hash((self._values(), self.extra))
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in self)
+        return f"{type(self).__name__}({args})"
+
+    def replace(self, **changes):
+        """Return a copy with the given fields (or extra parameters) replaced."""
+        kwargs = dict(self)
+        kwargs.update(changes)
+        return type(self)(**kwargs)
+
+    def content_hash(self):
+        """SHA-256 hex digest of the parameter values, stable across processes and sessions."""
+        if self._hash is None:
+            blob = json.dumps(dict(self), sort_keys=True, default=str)
+            object.__setattr__(self, "_hash", hashlib.sha256(blob.encode()).hexdigest())
+        return self._hash
+
+
+def parameter_grid(base, **axes):
+    """
+    Expand `base` into one SimulationParams per point of a Cartesian grid.
+
+    Args:
+        base (SimulationParams): Values shared by every grid point.
+        **axes: Parameter name -> sequence of values to sweep over.
+
+    Returns:
+        list: SimulationParams, with the last axis varying fastest.
+    """
+    names = list(axes)
+    return [
+        base.replace(**dict(zip(names, values)))
+        for values in product(*(axes[name] for name in names))
+    ]
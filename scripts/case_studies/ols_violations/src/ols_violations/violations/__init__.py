@@ -1,2 +1,23 @@
-from .homoscedasticity import HomoscedasticityStudy
-from .autocorrelation import AutocorrelationStudy
+import importlib
+
+# Study classes are resolved lazily so `ols_violations.violations.<module>` can be
+# imported without loading every study.
+_STUDIES = {
+    "HomoscedasticityStudy": ".homoscedasticity",
+    "AutocorrelationStudy": ".autocorrelation",
+    "DickeyFullerStudy": ".dickey_fuller",
+    "WeakExogeneityStudy": ".weak_exogeneity",
+    "MulticollinearityStudy": ".multicollinearity",
+}
+
+__all__ = list(_STUDIES)
+
+
+def __getattr__(name):
+    if name in _STUDIES:
+        return getattr(importlib.import_module(_STUDIES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_STUDIES))
@@ -1,42 +1,37 @@
-import os
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import t, norm
-from tqdm import tqdm
-from dataclasses import dataclass
-import statsmodels.api as sm
-from scipy.stats import t
-if 'axion' in plt.style.available:
-    plt.style.use('axion')
 
 from pathlib import Path
 MODULE = Path(__file__).name.strip(".py")
 OUT_PATH = list(Path(__file__).parents)[5] / f"src/broken-assumptions/figs/{MODULE}"
 
 from .base_violation import OLSViolationStudy
-from ..utils import SimulationParams
-
-def generate_ar1_errors(params : SimulationParams):
-    if "seed" in dict(params):
-        rng = np.random.default_rng(seed=params.seed)
-    else:
-        rng = np.random.default_rng()
-    u_t = rng.normal(scale=params.sigma, size=(params.n_simulations, params.n_samples))
-    et = np.zeros_like(u_t)
-    et[:, 0] = u_t[:, 0]
-    for i in range(1, params.n_samples):
-        et[:, i] = params.rho * et[:, i - 1] + u_t[:, i]
-    return et
+from ..figures import Figure
+from ..engines import arma_filter, bootstrap_slope_test, create_replicate_store, fill_rows, fit_ols_batch, generate_arma_errors, normal
+from ..utils import SimulationParams, parameter_grid
+
+def generate_ar1_errors(params : SimulationParams, stationary=False, dtype=None):
+    if dtype is None:
+        dtype = params.dtype
+    rng = np.random.default_rng(seed=params.seed)
+    return generate_arma_errors(
+        params.n_simulations,
+        params.n_samples,
+        ar=(params.rho,),
+        sigma=params.sigma,
+        rng=rng,
+        stationary=stationary,
+        dtype=dtype,
+    )
 
 
 def generate_iid_errors(params: SimulationParams):
-    if "seed" in dict(params):
-        rng = np.random.default_rng(seed=params.seed)
-    else:
-        rng = np.random.default_rng()
+    rng = np.random.default_rng(seed=params.seed)
     scale_adjusted = params.sigma / np.sqrt(1 - params.rho ** 2)
-    return rng.normal(
-        scale=scale_adjusted, size=(params.n_simulations, params.n_samples)
+    return normal(
+        rng,
+        scale=scale_adjusted,
+        size=(params.n_simulations, params.n_samples),
+        dtype=params.dtype,
     )
 
 
@@ -46,25 +41,10 @@ def get_beta_ols_estimates(params: SimulationParams, error_generator):
     et = error_generator(params)
     yt = params.alpha + params.beta * xt + et
 
-    X = sm.add_constant(xt)
-
-    beta_ols_vals = []
-    t_stats = []
-    false_positives = 0
-    for i in range(params.n_simulations):
-        mdl = sm.OLS(yt[0], X).fit()
-        beta = mdl.params[1]
-        beta_ols_vals.append(beta)
-        df = params.n_samples - len(mdl.params)
-        sigma_hat_sq = sm.ssr / (df)
-        ssx = np.var(xt) * xt.shape[0]
-        sdev_beta = np.sqrt(sigma_hat_sq / ssx)
-        t_stat = beta / sdev_beta
-        p_value = 1 - (t.cdf(t_stat, df=df) - t.cdf(-t_stat, df=df))
-        t_stats.append(t_stat)
-
-        if p_value < 0.05:
-            false_positives += 1
+    fit = fit_ols_batch(xt, yt)
+    beta_ols_vals = fit.beta
+    t_stats = fit.t_stat
+    false_positives = np.sum(fit.reject(0.05))
 
     print(f"False positive rate:\t{false_positives / params.n_simulations}")
 
@@ -80,6 +60,9 @@ def get_beta_ols_estimates(params: SimulationParams, error_generator):
 
 
 def plot_example_data(params: SimulationParams, results=None):
+    import matplotlib.pyplot as plt
+    from ..utils.plot_utils import use_style
+    use_style()
 
     if results:
         results
@@ -88,8 +71,7 @@ def plot_example_data(params: SimulationParams, results=None):
         yt_ar1_pos = results["ar1_pos"]["yt"]
         yt_ar1_neg = results["ar1_neg"]["yt"]
     if results is None:
-        params.n_simulations = 1
-        params.rho = abs(params.rho)
+        params = params.replace(n_simulations=1, rho=abs(params.rho))
 
         # Shared
         xt = np.linspace(-1, 1, params.n_samples)
@@ -103,8 +85,7 @@ def plot_example_data(params: SimulationParams, results=None):
         yt_ar1_pos = params.alpha + params.beta * xt + et
 
         # AR(1) neg
-        params.rho = - abs(params.rho)
-        et = generate_ar1_errors(params)
+        et = generate_ar1_errors(params.replace(rho=-abs(params.rho)))
         yt_ar1_neg = params.alpha + params.beta * xt + et
 
     fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(6,2), sharey=True)
@@ -142,12 +123,13 @@ def autocorrelation_study():
     )
 
 
+    params_pos, params_neg = parameter_grid(params, rho=[rho, -rho])
+
     # White noise
     results = {}
-    results['iid'] = get_beta_ols_estimates(params, generate_iid_errors)
-    results['ar1_pos'] = get_beta_ols_estimates(params, generate_iid_errors)
-    params.rho = - rho
-    results['ar1_neg'] = get_beta_ols_estimates(params, generate_iid_errors)
+    results['iid'] = get_beta_ols_estimates(params_pos, generate_iid_errors)
+    results['ar1_pos'] = get_beta_ols_estimates(params_pos, generate_ar1_errors)
+    results['ar1_neg'] = get_beta_ols_estimates(params_neg, generate_ar1_errors)
 
     plot_example_data(params)
 
@@ -163,168 +145,443 @@ class AutocorrelationStudy(OLSViolationStudy):
       ρ = 0.7   and   ρ = -0.7.
     Each subplot overlays the histogram for the AR(1) simulation (blue) and the IID simulation (red),
     plus a dashed black line showing the reference normal PDF (based on the AR(1) average variance).
+
+    Every fit also gets Newey-West (HAC) standard errors from the same residuals,
+    so the size of the naive t-test can be compared with the HAC-corrected one
+    (see `size_table`).
+
+    With `common_random_numbers` both error types and every ρ are driven by the
+    same standard normal innovations z: the AR(1) errors filter sigma * z and
+    the IID errors are z scaled to the AR(1) variance. Their slopes and test
+    decisions are then positively correlated, which shrinks the Monte Carlo
+    error of the AR(1)-vs-IID differences (see `variance_reduction_table`) the
+    more, the closer the two arms are; arms with very different rejection rates
+    cannot be coupled tightly. `antithetic` pairs every draw z with -z. Under
+    the null both the rejection and beta^2 are even in z, so the pairs only pay
+    off for odd statistics such as the mean slope; the table reports the
+    reduction actually achieved.
     """
 
+    _cached_attributes = ("results", "xt")
+
+    def __init__(
+        self,
+        rho_vals=(0.95, -0.95),
+        sigma=0.25,
+        store_dir=None,
+        chunk_size=10000,
+        hac_kernel="bartlett",
+        hac_bandwidth=None,
+        common_random_numbers=False,
+        antithetic=False,
+        **kwargs,
+    ):
+        """
+        Args:
+            rho_vals (sequence): Autoregressive coefficients to study.
+            sigma (float): Standard deviation of the AR(1) innovations.
+            store_dir (str | Path): If given, the simulated response matrices are
+                memory-mapped files in this directory instead of in-memory arrays,
+                and they are generated and fitted `chunk_size` rows at a time.
+            chunk_size (int): Rows per chunk when `store_dir` is used.
+            hac_kernel (str): Kernel of the HAC standard errors, see `engines.hac.KERNELS`.
+            hac_bandwidth (float): HAC bandwidth; defaults to the Newey-West plug-in rate.
+            common_random_numbers (bool): Drive both error types and every ρ from
+                the same innovations.
+            antithetic (bool): Draw innovations in antithetic pairs (z, -z).
+                Needs an even `n_simulations` (and `chunk_size` with `store_dir`).
+            **kwargs: Forwarded to `OLSViolationStudy`.
+        """
+        super().__init__(**kwargs)
+        self.rho_vals = list(rho_vals)
+        self.sigma = sigma
+        self.store_dir = store_dir
+        self.chunk_size = chunk_size
+        self.hac = dict(kernel=hac_kernel, bandwidth=hac_bandwidth)
+        self.common_random_numbers = common_random_numbers
+        self.antithetic = antithetic
+        self.true_beta = 0.0  # Under the null, no relationship
+        if antithetic and (self.n_simulations % 2 or (store_dir is not None and chunk_size % 2)):
+            raise ValueError("antithetic pairs need an even n_simulations and chunk_size.")
+
+    @property
+    def params(self):
+        return super().params.replace(
+            rho_vals=self.rho_vals,
+            sigma=self.sigma,
+            hac_kernel=self.hac["kernel"],
+            hac_bandwidth=self.hac["bandwidth"],
+            common_random_numbers=self.common_random_numbers,
+            antithetic=self.antithetic,
+        )
+
     def simulate(self, seed=None):
         """
-        Run simulations for two values of ρ (0.7 and -0.7). In each case set up:
+        Run simulations for each value of ρ in `rho_vals`. In each case set up:
           - AR(1) error simulations.
           - IID error simulations with inflated variance.
-        We then compute the OLS beta estimates, their estimated variance, and the false positive rate.
+        We then compute the OLS beta estimates, their estimated variance, and the false positive
+        rates of the naive and the HAC t-tests. With `common_random_numbers` the shared
+        innovations are drawn first (into `<store_dir>/innovations.dat` when `store_dir` is set).
         """
-        if seed is not None:
-            np.random.seed(seed)
+        self.rng = np.random.default_rng(seed)
 
         # Store simulation results per autoregressive coefficient.
         self.results = {}
 
-        # Define sigma and the predictor (X)
-        sigma = 0.25
+        # Define the predictor (X)
         xt = np.linspace(-1, 1, self.n_samples)
         self.xt = xt  # in case it is needed later
-        self.true_beta = 0.0  # Under the null, no relationship
-        self.rho_vals = [0.95, -0.95]
+
+        # Innovations shared by every arm under common random numbers
+        shared = None
+        if self.common_random_numbers:
+            shared = self._replicates("innovations", lambda size: self._draw_innovations(self.rng, size))
 
         # Run simulation for each value of ρ
         for rho in self.rho_vals:
-            # AR(1) simulation for errors:
-            yt_ar1 = self._generate_ar1_errors(rho, sigma)
-            beta_ar1, avg_beta_var_ar1, false_rate_ar1 = self._run_ols_simulation(xt, yt_ar1)
-
-            # IID simulation (variance inflated to match AR(1)):
-            yt_iid = self._generate_iid_errors(rho, sigma)
-            beta_iid, avg_beta_var_iid, false_rate_iid = self._run_ols_simulation(xt, yt_iid)
-
-            # Save the results by ρ value.
-            self.results[rho] = {
-                "yt_ar1" : yt_ar1,
-                "yt_iid" : yt_iid,
-                "beta_ar1": beta_ar1,
-                "avg_beta_var_ar1": avg_beta_var_ar1,
-                "false_rate_ar1": false_rate_ar1,
-                "beta_iid": beta_iid,
-                "avg_beta_var_iid": avg_beta_var_iid,
-                "false_rate_iid": false_rate_iid,
-            }
+            self.results[rho] = {}
+            for kind in ("ar1", "iid"):
+                # AR(1) errors, or IID errors with the variance inflated to match AR(1)
+                draw = self._error_draw(rho, kind, shared)
+                yt = self._replicates(f"rho={rho}_{kind}", draw)
+                arm = self._run_ols_simulation(xt, yt)
+                self.results[rho][f"yt_{kind}"] = yt
+                self.results[rho].update({f"{name}_{kind}": value for name, value in arm.items()})
+
+    def _simulate_chunk(self, rng, size):
+        """
+        Streaming-mode counterpart of `simulate`: per-replicate slopes, slope
+        variance estimates, t-statistics and 5% rejections of the naive and the HAC t-tests
+        for every ρ and both error types.
+        Quantities are named "<rho>/<quantity>_<ar1|iid>".
+        """
+        xt = np.linspace(-1, 1, self.n_samples)
+        shared = self._draw_innovations(rng, size) if self.common_random_numbers else None
+        chunk = {}
+        for rho in self.rho_vals:
+            for kind in ("ar1", "iid"):
+                yt = self._error_draw(rho, kind, shared, rng=rng)(size)
+                fit = fit_ols_batch(xt, yt, df=self.n_samples - 1, hac=self.hac)
+                chunk[f"{rho}/beta_{kind}"] = fit.beta
+                chunk[f"{rho}/beta_var_{kind}"] = fit.beta_var
+                chunk[f"{rho}/t_{kind}"] = fit.t_stat
+                chunk[f"{rho}/reject_{kind}"] = fit.reject(0.05)
+                chunk[f"{rho}/reject_hac_{kind}"] = fit.reject_hac(0.05)
+        return chunk
+
+    def _adaptive_targets(self, rate_tol, var_rtol):
+        """Naive and HAC false positive rates, and the slope variance, per ρ and error type."""
+        targets = {}
+        for rho in self.rho_vals:
+            for kind in ("ar1", "iid"):
+                targets[f"{rho}/reject_{kind}"] = ("rate", rate_tol)
+                targets[f"{rho}/reject_hac_{kind}"] = ("rate", rate_tol)
+                targets[f"{rho}/beta_{kind}"] = ("var", var_rtol)
+        return targets
 
-    
+    def _histogram_edges(self):
+        """
+        Beta histogram edges per ρ and error type: 50 bins spanning ±5 approximate
+        standard errors of beta, cropped to the plotted range [-1.5, 1.5].
+        """
+        ssx = np.sum(np.linspace(-1, 1, self.n_samples) ** 2)
+        edges = {}
+        for rho in self.rho_vals:
+            # Long-run standard deviation of the AR(1) errors and standard deviation of the IID errors
+            scales = {"ar1": self.sigma / abs(1 - rho), "iid": self.sigma / np.sqrt(1 - rho ** 2)}
+            for kind, scale in scales.items():
+                half_width = min(1.5, 5 * scale / np.sqrt(ssx))
+                edges[f"{rho}/beta_{kind}"] = np.linspace(-half_width, half_width, 51)
+        return edges
+
+    def _replicates(self, name, draw):
+        """
+        Draw all replicates with `draw(size)`, either in memory or, when `store_dir`
+        is set, chunk by chunk into a memory-mapped file `<store_dir>/<name>.dat`.
+        Both paths consume the random stream identically.
+        """
+        with self.span("generate_errors", replicates=self.n_simulations):
+            if self.store_dir is None:
+                return draw(self.n_simulations)
+            out = create_replicate_store(
+                Path(self.store_dir) / f"{name}.dat", self.n_simulations, self.n_samples, dtype=self.dtype
+            )
+            return fill_rows(out, draw, self.chunk_size)
+
+    def _error_draw(self, rho, kind, shared=None, rng=None):
+        """
+        Function drawing `size` error series of type `kind` ("ar1" or "iid") for ρ.
+
+        Without variance reduction these are the independent draws of
+        `_generate_ar1_errors` and `_generate_iid_errors`. Otherwise the errors
+        are built from standard normal innovations: consecutive rows of `shared`
+        under common random numbers, or fresh (possibly antithetic) draws.
+        """
+        rng = self.rng if rng is None else rng
+        if shared is None and not self.antithetic:
+            if kind == "ar1":
+                return lambda size: self._generate_ar1_errors(rho, self.sigma, rng=rng, n_simulations=size)
+            return lambda size: self._generate_iid_errors(rho, self.sigma, rng=rng, n_simulations=size)
+
+        start = 0
+
+        def draw(size):
+            nonlocal start
+            if shared is None:
+                z = self._draw_innovations(rng, size)
+            else:
+                z = shared[start:start + size]
+                start += size
+            if kind == "ar1":
+                return arma_filter(self.sigma * z, ar=(rho,), dtype=self.dtype)
+            return z * self.dtype.type(self.sigma / np.sqrt(1 - rho ** 2))
+
+        return draw
+
+    def _draw_innovations(self, rng, size):
+        """Standard normal innovations; with `antithetic`, rows 2i and 2i + 1 are z and -z."""
+        if not self.antithetic:
+            return normal(rng, size=(size, self.n_samples), dtype=self.dtype)
+        half = normal(rng, size=(-(-size // 2), self.n_samples), dtype=self.dtype)
+        z = np.empty((2 * half.shape[0], self.n_samples), dtype=self.dtype)
+        z[0::2] = half
+        z[1::2] = -half
+        return z[:size]
+
+    def _generate_ar1_errors(self, rho, sigma, stationary=False, rng=None, n_simulations=None):
+        """
+        Draw one AR(1) error series per simulation, e[t] = rho * e[t-1] + u[t]
+        with u ~ N(0, sigma^2), from the study's random generator unless `rng` is given.
+        """
+        return generate_arma_errors(
+            n_simulations or self.n_simulations,
+            self.n_samples,
+            ar=(rho,),
+            sigma=sigma,
+            rng=self.rng if rng is None else rng,
+            stationary=stationary,
+            dtype=self.dtype,
+        )
+
+    def _generate_iid_errors(self, rho, sigma, rng=None, n_simulations=None):
+        """
+        Draw IID errors whose variance matches the stationary AR(1) variance
+        sigma^2 / (1 - rho^2).
+        """
+        rng = self.rng if rng is None else rng
+        scale_adjusted = sigma / np.sqrt(1 - rho ** 2)
+        size = (n_simulations or self.n_simulations, self.n_samples)
+        return normal(rng, scale=scale_adjusted, size=size, dtype=self.dtype)
 
     def _run_ols_simulation(self, xt, yt):
         """
         For a given predictor xt and a 2D array of responses yt (one row per simulation),
         run OLS regressions to obtain:
-          - The array of beta (slope) estimates.
-          - The average estimated variance of beta.
-          - The false positive rate based on a two-sided t-test at 5% significance.
+          - beta: The array of beta (slope) estimates.
+          - avg_beta_var: The average estimated variance of beta.
+          - reject: The per-replicate decisions of a two-sided t-test at 5% significance.
+          - false_rate: The false positive rate of that test.
+          - false_rate_hac: The same rate with HAC standard errors.
+
+        All replicates are fitted at once by `fit_ols_batch`, and the HAC variances
+        are computed from the same residual matrix.
+        """
+        chunk_size = self.chunk_size if self.store_dir is not None else None
+        with self.span("fit", replicates=len(yt)):
+            fit = fit_ols_batch(xt, yt, df=self.n_samples - 1, chunk_size=chunk_size, hac=self.hac)
+
+        with self.span("inference", replicates=len(yt)):
+            rejected = fit.reject(0.05)
+            return {
+                "beta": fit.beta,
+                "avg_beta_var": fit.beta_var.mean(),
+                "reject": rejected,
+                "false_rate": np.mean(rejected),
+                "false_rate_hac": np.mean(fit.reject_hac(0.05)),
+            }
+
+    def variance_reduction_table(self):
         """
-        beta_ols_list = []
-        false_positives = 0
-        sum_beta_var_hat = 0.0
-
-        # Denom used in the variance estimator for beta
-        xt_mean = np.mean(xt)
-        denom = np.sum((xt - xt_mean) ** 2)
-
-        # Loop over simulations – you can wrap with tqdm if desired.
-        for i in range(self.n_simulations):
-            cov_val = np.cov(xt, yt[i, :], ddof=self.n_samples - 1)[0, 1]
-            var_x = np.var(xt, ddof=self.n_samples - 1)
-            beta_ols = cov_val / var_x
-            beta_ols_list.append(beta_ols)
-
-            # Estimate sigma squared from residuals and compute beta variance estimate.
-            residuals = yt[i, :] - beta_ols * xt
-            sigma_hat_sq = np.var(residuals, ddof=1)
-            beta_var_hat = sigma_hat_sq / denom
-            sum_beta_var_hat += beta_var_hat
-
-            # t-statistic for testing beta = 0:
-            t_stat = beta_ols / np.sqrt(beta_var_hat)
-            p_value = 1 - (t.cdf(t_stat, df=self.n_samples - 1) -
-                           t.cdf(-t_stat, df=self.n_samples - 1))
-            if p_value < 0.05:
-                false_positives += 1
-
-        avg_beta_var_hat = sum_beta_var_hat / self.n_simulations
-        false_positive_rate = false_positives / self.n_simulations
-
-        return np.array(beta_ols_list), avg_beta_var_hat, false_positive_rate
-
-    def render_plots(self):
+        Monte Carlo precision of the AR(1)-vs-IID differences per ρ, against
+        independent arms with the same number of replicates.
+
+        The differences are taken per replicate, d = a_ar1 - a_iid, for the
+        rejection indicator (false positive rate) and for beta^2 (beta variance,
+        as the true slope is zero). With antithetic pairs the pair means of d
+        are the independent units. The standard error of independent arms,
+        sqrt((Var(a_ar1) + Var(a_iid)) / n), uses the marginal variances of the
+        same run.
+
+        Returns:
+            np.recarray: One row per ρ and quantity with the mean difference, its
+                standard error, the standard error of independent arms and the
+                variance reduction factor, their squared ratio, i.e. how many
+                times fewer replicates give the same confidence interval width.
         """
-        Render a single figure with two subplots. Each subplot overlays histogram
-        of OLS beta estimates from AR(1) and IID errors for a fixed value of ρ
-        (either 0.7 or -0.7). The subplot title shows the corresponding ρ value.
+        rows = []
+        for rho in self.rho_vals:
+            res = self.results[rho]
+            arms = {
+                "false_rate": (res["reject_ar1"], res["reject_iid"]),
+                "beta_var": (res["beta_ar1"] ** 2, res["beta_iid"] ** 2),
+            }
+            for quantity, (a, b) in arms.items():
+                a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+                d = a - b
+                units = d.reshape(-1, 2).mean(axis=1) if self.antithetic else d
+                var_mean = np.var(units, ddof=1) / units.size
+                var_independent = (np.var(a, ddof=1) + np.var(b, ddof=1)) / d.size
+                with np.errstate(divide="ignore"):
+                    # Identical arms, e.g. ρ = 0 under common random numbers, give inf
+                    reduction = var_independent / var_mean
+                rows.append((
+                    rho, quantity, d.mean(), np.sqrt(var_mean), np.sqrt(var_independent), reduction,
+                ))
+        names = ["rho", "quantity", "difference", "mcse", "mcse_independent", "variance_reduction"]
+        return np.rec.fromrecords(rows, names=names)
+
+    def size_table(self):
         """
+        Size of the 5% t-test for beta = 0 with naive and with HAC standard errors.
 
-        # 1) Example data
-
-        # Fetch the iid data:
-        results = self.results[self.rho_vals[0]]
-        yt_iid = results['yt_iid'][0] # get the first one
-        yt_ar1_pos = results['yt_ar1'][0] 
-        results = self.results[self.rho_vals[1]]
-        yt_ar1_neg = results['yt_ar1'][0] 
-
-        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(6,2.0), sharey=True)
-        ax1.scatter(self.xt, yt_iid, label=r'WN', s=5)
-        ax2.scatter(self.xt, yt_ar1_pos, label=f"$\\rho = {self.rho_vals[0]}$", s=5)
-        ax3.scatter(self.xt, yt_ar1_neg, label=f"$\\rho = {self.rho_vals[1]}$", s=5)
-        ax1.set_ylabel(r'$\epsilon$')
-        ax1.set_xlabel('$x$')
-        ax2.set_xlabel('$x$')
-        ax3.set_xlabel('$x$')
-        ax1.text(0, 2.5, r"WN", horizontalalignment='center')
-        ax2.text(0, 2.5, f"$\\rho = {self.rho_vals[0]}$", horizontalalignment="center")
-        ax3.text(0, 2.5, f"$\\rho = {self.rho_vals[1]}$", horizontalalignment="center")
-        plt.ylim(-4, 4)
-        plt.tight_layout()
-        self.save_figure("example_data")
-        plt.close()
-
-        # 2) Histogram of beta_ols estimates compared to gaussian
-        fig, axes = plt.subplots(1, 2, figsize=(6, 3), sharey=True)
-        bins = 50
-
-        i = 0
-        for ax, rho in zip(axes, self.rho_vals):
-            results = self.results[rho]
-
-            # Histogram for AR(1) errors (blue)
-            ax.hist(
-                results["beta_ar1"],
-                bins,
-                histtype="step",
-                density=True,
-                color="blue",
-                label="AR(1) Errors",
-            )
-            # Histogram for IID errors (red)
-            ax.hist(
-                results["beta_iid"],
-                bins,
-                histtype="step",
-                density=True,
-                color="red",
-                label="IID Errors",
-            )
-            # Overlay a normal PDF based on the AR(1) simulation's average beta variance
-            x_vals = np.linspace(-1.5, 1.5, 200)
-            pdf_vals = norm(
-                loc=0, scale=np.sqrt(results["avg_beta_var_ar1"])
-            ).pdf(x_vals)
-            ax.plot(x_vals, pdf_vals, "k--", lw=2, label="Normal PDF")
-
-            ax.set_title(r"$\rho = {}$".format(rho))
-            ax.set_xlabel(r"OLS $\hat{\beta}$")
-            if rho == self.rho_vals[0]:
-                ax.set_ylabel("Density")
-            if i == 0:
-                ax.legend()
-                i += 1
-
-            ax.set_xlim(-1.5, 1.5)
-
-        plt.tight_layout()
-        self.save_figure("beta_ols_histogram")
-        plt.close()
+        Works after `simulate` and after `simulate_streaming`.
+
+        Returns:
+            np.recarray: One row per ρ and error type ("ar1" or "iid") with the
+                false positive rates of the naive and the HAC test.
+        """
+        rows = []
+        for rho in self.rho_vals:
+            for kind in ("ar1", "iid"):
+                if hasattr(self, "results"):
+                    naive = self.results[rho][f"false_rate_{kind}"]
+                    hac = self.results[rho][f"false_rate_hac_{kind}"]
+                else:
+                    naive = self.summary.rejections[f"{rho}/reject_{kind}"].rate
+                    hac = self.summary.rejections[f"{rho}/reject_hac_{kind}"].rate
+                rows.append((rho, kind, naive, hac))
+        return np.rec.fromrecords(rows, names=["rho", "errors", "false_rate", "false_rate_hac"])
+
+    def bootstrap_size_table(self, n_resamples=199, method="stationary", block_length=None, seed=None, n_replicates=None):
+        """
+        Size of the 5% block-bootstrap percentile test for beta = 0, next to the
+        naive and HAC t-tests, from the responses kept by `simulate`.
+
+        Args:
+            n_resamples (int): Bootstrap resamples per replicate.
+            method (str): "moving_block" or "stationary"; see `engines.bootstrap`.
+            block_length (float): (Mean) block length; defaults to round(n^(1/3)).
+            seed (int): Seed of the resampling.
+            n_replicates (int): Use only the first replicates of every arm, since
+                every replicate costs `n_resamples` refits.
+
+        Returns:
+            np.recarray: The rows of `size_table` plus the bootstrap false positive rate.
+        """
+        rng = np.random.default_rng(seed)
+        table = self.size_table()
+        rates = []
+        for rho, kind in zip(table.rho, table.errors):
+            yt = self.results[rho][f"yt_{kind}"][:n_replicates]
+            with self.span("bootstrap", replicates=len(yt)):
+                # Chunked by the engine's memory budget, which also pages in memory-mapped responses
+                test = bootstrap_slope_test(
+                    self.xt, yt, n_resamples=n_resamples, rng=rng, method=method, block_length=block_length
+                )
+            rates.append(np.mean(test.reject()))
+        return np.rec.fromarrays(
+            [table.rho, table.errors, table.false_rate, table.false_rate_hac, rates],
+            names=["rho", "errors", "false_rate", "false_rate_hac", "false_rate_bootstrap"],
+        )
+
+    def figures(self):
+        """
+        Two figures: example series for white noise and every value of ρ, and
+        the histograms of OLS beta estimates from AR(1) and IID errors per ρ.
+
+        After `simulate_streaming` only the histograms are available, taken from
+        the streaming summary, and the example series figure is left out.
+        """
+        streaming = not hasattr(self, "results")
+
+        def histogram(rho, kind):
+            values = None if streaming else self.results[rho][f"beta_{kind}"]
+            return self.histogram(f"{rho}/beta_{kind}", values)
+
+        def avg_beta_var_ar1(rho):
+            if streaming:
+                return self.summary.moments[f"{rho}/beta_var_ar1"].mean
+            return self.results[rho]["avg_beta_var_ar1"]
+
+        figures = [
+            Figure(
+                self.figure_path("beta_ols_histogram"),
+                plot_beta_histograms,
+                dict(
+                    rho_vals=self.rho_vals,
+                    beta_ar1=[histogram(rho, "ar1") for rho in self.rho_vals],
+                    beta_iid=[histogram(rho, "iid") for rho in self.rho_vals],
+                    avg_beta_var_ar1=[avg_beta_var_ar1(rho) for rho in self.rho_vals],
+                ),
+            ),
+        ]
+        if not streaming:
+            figures.insert(0, Figure(
+                self.figure_path("example_data"),
+                plot_example_series,
+                dict(
+                    xt=self.xt,
+                    yt_iid=self.results[self.rho_vals[0]]["yt_iid"][0],
+                    yt_ar1=[self.results[rho]["yt_ar1"][0] for rho in self.rho_vals],
+                    rho_vals=self.rho_vals,
+                ),
+            ))
+        return figures
+
+
+def plot_example_series(xt, yt_iid, yt_ar1, rho_vals):
+    """One example response for white noise errors and for AR(1) errors with every ρ."""
+    import matplotlib.pyplot as plt
+
+    series = [yt_iid, *yt_ar1]
+    labels = ["WN", *(f"$\\rho = {rho}$" for rho in rho_vals)]
+    fig, axes = plt.subplots(1, len(series), figsize=(2 * len(series), 2.0), sharey=True, squeeze=False)
+    for ax, yt, label in zip(axes[0], series, labels):
+        ax.scatter(xt, yt, label=label, s=5)
+        ax.set_xlabel('$x$')
+        ax.text(0, 2.5, label, horizontalalignment="center")
+    axes[0, 0].set_ylabel(r'$\epsilon$')
+    plt.ylim(-4, 4)
+    plt.tight_layout()
+
+
+def plot_beta_histograms(rho_vals, beta_ar1, beta_iid, avg_beta_var_ar1):
+    """
+    One subplot per ρ overlaying the histograms of OLS beta estimates from AR(1)
+    errors (blue) and IID errors (red), plus the normal PDF implied by the
+    average estimated variance of beta under AR(1) errors.
+
+    The histograms are `Histogram` accumulators (or arrays of estimates).
+    """
+    import matplotlib.pyplot as plt
+    from scipy.stats import norm
+    from ..utils.plot_utils import plot_hist
+
+    fig, axes = plt.subplots(1, len(rho_vals), figsize=(max(6, 3 * len(rho_vals)), 3), sharey=True, squeeze=False)
+    x_vals = np.linspace(-1.5, 1.5, 200)
+
+    for i, (ax, rho) in enumerate(zip(axes[0], rho_vals)):
+        plot_hist(beta_ar1[i], ax=ax, histtype="step", density=True, color="blue", label="AR(1) Errors")
+        plot_hist(beta_iid[i], ax=ax, histtype="step", density=True, color="red", label="IID Errors")
+        pdf_vals = norm(loc=0, scale=np.sqrt(avg_beta_var_ar1[i])).pdf(x_vals)
+        ax.plot(x_vals, pdf_vals, "k--", lw=2, label="Normal PDF")
+
+        ax.set_title(r"$\rho = {}$".format(rho))
+        ax.set_xlabel(r"OLS $\hat{\beta}$")
+        if i == 0:
+            ax.set_ylabel("Density")
+            ax.legend()
+        ax.set_xlim(-1.5, 1.5)
+
+    plt.tight_layout()
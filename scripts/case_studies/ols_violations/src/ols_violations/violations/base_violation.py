@@ -1,9 +1,28 @@
 import os
-import matplotlib.pyplot as plt
+
+import numpy as np
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..engines import Histogram, StreamingSummary
+from ..figures import build_figures
+from ..instrumentation import Instrumentation, profiled, write_report
+from ..utils import SimulationParams
+from ..parallel import parallel_map, simulate_chunk_summary
 
 class OLSViolationStudy(ABC):
-    def __init__(self, n_simulations=10000, n_samples=100):
+    # Bump when a change to `simulate` alters its results, to invalidate cached entries.
+    VERSION = 1
+
+    # Attributes set by `simulate` that make up its results (see `simulate_cached`).
+    _cached_attributes = ()
+
+    # Set by `profile`; spans are no-ops while it is None.
+    instrumentation = None
+
+    def __init__(self, n_simulations=10000, n_samples=100, dtype=np.float64):
         """
         Base class for OLS violation studies.
 
@@ -12,38 +31,303 @@ class OLSViolationStudy(ABC):
             n_simulations (int): Number of Monte Carlo simulations.
             n_samples (int): Number of samples per simulation.
             true_beta (float): True beta coefficient.
+            dtype (np.dtype): Precision of the simulated errors and responses,
+                np.float64 or np.float32. Fits accumulate in float64 either way.
         """
         # Automatically derive subdir from class name
         self.subdir = self.__class__.__name__.replace("Study", "").lower()
         self.n_simulations = n_simulations
         self.n_samples = n_samples
+        self.dtype = np.dtype(dtype)
 
     @abstractmethod
     def simulate(self, seed=None):
         """Method to run simulations (implemented in subclasses)."""
         pass
 
-    @abstractmethod
-    def render_plots(self):
-        """Method to generate and display plots (implemented in subclasses)."""
-        pass
+    @property
+    def params(self):
+        """Parameters that determine the simulation results, as SimulationParams."""
+        return SimulationParams(
+            n_simulations=self.n_simulations, n_samples=self.n_samples, dtype=self.dtype.name
+        )
+
+    def span(self, name, replicates=None):
+        """
+        Context manager timing a stage of the study as span `name` when the
+        study is instrumented (see `profile`), and doing nothing otherwise.
+        """
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.span(name, replicates)
+
+    def profile(self, seed=None, render=False, memory=False, profiler=None, output=None):
+        """
+        Run `simulate` (and optionally `render_plots`) with instrumentation enabled.
+
+        Subclasses wrap their stages (error generation, fitting, inference) in
+        `span`, so the report shows where the time goes per study. Stages run in
+        worker processes, as in `simulate_streaming` with several workers, are
+        not recorded.
+
+        Args:
+            seed (int): Seed passed to `simulate`.
+            render (bool): Also time `render_plots`.
+            memory (bool): Record per-stage memory peaks with tracemalloc. This
+                slows allocation-heavy stages down many times over, so time and
+                measure memory in separate runs.
+            profiler (str): Optionally also run "cprofile" or "pyinstrument".
+            output (str | Path): Path of the JSON report. The profile, if any, is
+                written next to it with suffix ".prof" (cProfile) or ".html" (pyinstrument).
+
+        Returns:
+            dict: The report: study, params, per-span statistics (see
+                `Instrumentation.report`) and the profile location.
+        """
+        profile_output = None
+        if profiler is not None and output is not None:
+            suffix = ".prof" if profiler == "cprofile" else ".html"
+            profile_output = Path(output).with_suffix(suffix)
+            profile_output.parent.mkdir(parents=True, exist_ok=True)
+
+        self.instrumentation = Instrumentation(memory=memory)
+        try:
+            with self.instrumentation.tracing(), profiled(profiler, profile_output) as profile_info:
+                with self.span("simulate", replicates=self.n_simulations):
+                    self.simulate(seed=seed)
+                if render:
+                    with self.span("render"):
+                        self.render_plots()
+        finally:
+            spans = self.instrumentation.report()
+            self.instrumentation = None
+
+        report = {
+            "study": type(self).__qualname__,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "params": dict(self.params),
+            "seed": seed,
+            "memory_traced": memory,
+            "spans": spans,
+            "profile": profile_info or None,
+        }
+        if output is not None:
+            write_report(report, output)
+        return report
+
+    def simulate_cached(self, seed=None, cache=None):
+        """
+        Load the results of `simulate(seed)` from `cache`, simulating and storing
+        them only on a cache miss.
+
+        Args:
+            seed (int): Seed passed to `simulate`.
+            cache (ResultCache): On-disk result cache; None simply calls `simulate`.
+        """
+        if cache is None:
+            return self.simulate(seed=seed)
+
+        key = cache.key(self, seed)
+        results = cache.load(key)
+        if results is None:
+            self.simulate(seed=seed)
+            results = {name: getattr(self, name) for name in self._cached_attributes}
+            cache.store(key, results)
+        else:
+            for name, value in results.items():
+                setattr(self, name, value)
+
+    def simulate_streaming(self, seed=None, chunk_size=10000, max_workers=1):
+        """
+        Run the simulation in fixed-size chunks and fold each chunk into online
+        accumulators, so peak memory does not grow with `n_simulations`.
+
+        Every chunk draws from its own stream spawned from `np.random.SeedSequence(seed)`
+        and chunk summaries are merged in chunk order, so the result is bit-identical
+        for any `max_workers`. The summary is stored in `self.summary` (see `StreamingSummary`).
+
+        Args:
+            seed (int): Seed of the root SeedSequence.
+            chunk_size (int): Maximum number of replicates held in memory at once per worker.
+            max_workers (int): Number of worker processes; None uses every core.
+        """
+        sizes, seeds = zip(*self._chunk_plan(seed, chunk_size))
+        n_chunks = len(sizes)
+        chunk_summaries = parallel_map(
+            simulate_chunk_summary, [self] * n_chunks, sizes, seeds, max_workers=max_workers
+        )
+
+        self.summary = StreamingSummary(histogram_edges=self._histogram_edges())
+        for chunk_summary in chunk_summaries:
+            self.summary.merge(chunk_summary)
+        return self.summary
 
-    def save_figure(self, filename):
+    def simulate_adaptive(
+        self,
+        seed=None,
+        targets=None,
+        rate_tol=0.0025,
+        var_rtol=0.02,
+        chunk_size=10000,
+        max_simulations=None,
+        max_workers=1,
+    ):
         """
-        Saves the current figure to the inferred subdirectory inside `/src/broken-assumptions/figs/`.
+        Streaming simulation that stops once every tracked quantity is precise enough.
+
+        Rounds of `max_workers` chunks are simulated and folded into the summary
+        until the Monte Carlo standard error of every target is within its
+        tolerance, or `max_simulations` replicates have been used. Chunks are
+        seeded as in `simulate_streaming`, so a run that stops after k chunks
+        gives the summary of `simulate_streaming` with k * chunk_size replicates.
+
+        Args:
+            seed (int): Seed of the root SeedSequence.
+            targets (dict): Quantity name -> (statistic, tolerance), with statistic
+                "rate" (rejection rate, absolute tolerance), "mean" (absolute
+                tolerance) or "var" (variance, tolerance relative to the estimate).
+                Defaults to `_adaptive_targets(rate_tol, var_rtol)`.
+            rate_tol (float): Default tolerance for rejection rates.
+            var_rtol (float): Default relative tolerance for variances.
+            chunk_size (int): Replicates per chunk.
+            max_simulations (int): Replicate budget; defaults to `n_simulations`.
+            max_workers (int): Number of worker processes, i.e. chunks per round;
+                None uses every core.
+
+        Returns:
+            StreamingSummary: Also stored in `self.summary`; the replicates used,
+                whether every target converged and the final standard errors are
+                stored in `self.stopping`.
+        """
+        if max_simulations is None:
+            max_simulations = self.n_simulations
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_simulations < 1 or chunk_size < 1:
+            raise ValueError(
+                f"simulate_adaptive needs max_simulations >= 1 and chunk_size >= 1, "
+                f"got {max_simulations} and {chunk_size}."
+            )
+        if targets is None:
+            targets = self._adaptive_targets(rate_tol, var_rtol)
+        if not targets:
+            raise ValueError(f"{self.__class__.__name__} has no default adaptive targets; pass `targets`.")
+
+        root = np.random.SeedSequence(seed)
+        self.summary = StreamingSummary(histogram_edges=self._histogram_edges())
+        n_done = 0
+        while True:
+            sizes = [
+                min(chunk_size, max_simulations - n_done - i * chunk_size)
+                for i in range(max_workers)
+            ]
+            sizes = [size for size in sizes if size > 0]
+            chunk_summaries = parallel_map(
+                simulate_chunk_summary, [self] * len(sizes), sizes, root.spawn(len(sizes)),
+                max_workers=max_workers,
+            )
+            for chunk_summary in chunk_summaries:
+                self.summary.merge(chunk_summary)
+            n_done += sum(sizes)
+
+            mcse = {name: self._mcse(name, statistic) for name, (statistic, _) in targets.items()}
+            converged = all(mcse[name] <= tol for name, (_, tol) in targets.items())
+            if converged or n_done >= max_simulations:
+                break
+
+        self.stopping = {
+            "n_simulations": n_done,
+            "converged": converged,
+            "mcse": {name: float(value) for name, value in mcse.items()},
+        }
+        return self.summary
+
+    def _adaptive_targets(self, rate_tol, var_rtol):
+        """
+        Default targets of `simulate_adaptive`: quantity name -> (statistic, tolerance).
+        Studies list the rejection rates and estimator variances they report.
+        """
+        return {}
+
+    def _mcse(self, name, statistic):
+        """
+        Monte Carlo standard error of `statistic` of quantity `name` in the summary;
+        relative for "var". It is infinite while too few replicates have been
+        folded in to estimate it, and zero for the variance of a constant quantity.
+        """
+        if statistic == "rate":
+            return self.summary.rejections[name].mcse
+        if statistic not in ("mean", "var"):
+            raise ValueError(f"Unknown statistic {statistic!r}; use 'rate', 'mean' or 'var'.")
+
+        moments = self.summary.moments[name]
+        if np.isnan(moments.mean):
+            raise ValueError(f"Quantity {name!r} has NaN values and cannot be an adaptive target.")
+        if moments.count < 4:
+            return np.inf
+        if statistic == "mean":
+            return moments.mean_mcse
+        if moments.variance == 0:
+            return 0.0
+        return moments.variance_mcse / moments.variance
+
+    def _chunk_plan(self, seed, chunk_size):
+        """Split `n_simulations` into (size, SeedSequence) pairs, one per chunk."""
+        n_chunks = -(-self.n_simulations // chunk_size)
+        seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+        sizes = [min(chunk_size, self.n_simulations - i * chunk_size) for i in range(n_chunks)]
+        return list(zip(sizes, seeds))
+
+    def _simulate_chunk(self, rng, size):
+        """
+        Simulate `size` replicates with generator `rng` for streaming mode.
+
+        Returns:
+            dict: Quantity name -> 1-D array with one value per replicate. Boolean
+                arrays are counted as test rejections.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support streaming mode.")
+
+    def _histogram_edges(self):
+        """Fixed histogram bin edges per quantity name used in streaming mode and figures."""
+        return {}
+
+    def histogram(self, name, values=None):
+        """
+        Histogram of quantity `name` on the edges from `_histogram_edges`.
 
         Args:
-            index (int): The figure number (e.g., 1, 2, 3) to append to the filename.
+            name (str): Quantity name, as returned by `_simulate_chunk`.
+            values (np.ndarray): Per-replicate values to bin. None returns the
+                histogram accumulated by the last `simulate_streaming` run.
+
+        Returns:
+            Histogram: Pre-binned counts, which the figures plot without the raw values.
         """
-        # Define the full path to the subdirectory
-        base_dir = os.path.join("src", "broken-assumptions", "figs", self.subdir)
+        if values is None:
+            return self.summary.histograms[name]
+        return Histogram(self._histogram_edges()[name]).update(values)
 
-        # Create the directory if it doesn't exist
-        os.makedirs(base_dir, exist_ok=True)
+    @abstractmethod
+    def figures(self):
+        """
+        Figures of the simulated study (implemented in subclasses).
+
+        Returns:
+            list: `Figure` specifications whose inputs are taken from the simulation
+                results, so they can be rendered without the study object.
+        """
+        pass
+
+    def render_plots(self, manifest=None, max_workers=1, force=False):
+        """
+        Render every figure of `figures()`; see `build_figures` for the arguments.
 
-        # Construct full file path with index
-        file_path = os.path.join(base_dir, f"{filename}.svg")
+        Returns:
+            list: Paths of the figures that were rendered.
+        """
+        return build_figures(self.figures(), manifest=manifest, max_workers=max_workers, force=force)
 
-        # Save the figure
-        plt.savefig(file_path, format="svg", bbox_inches="tight")
-        print(f"Figure saved: {file_path}")
+    def figure_path(self, filename, suffix=".svg"):
+        """Output path of figure `filename` in the study's subdirectory of `src/broken-assumptions/figs/`."""
+        return Path("src", "broken-assumptions", "figs", self.subdir, f"{filename}{suffix}")
@@ -0,0 +1,143 @@
+from .base_violation import OLSViolationStudy
+import numpy as np
+
+from ..engines import critical_values, dickey_fuller_tau, simulate_random_walks
+from ..figures import Figure
+
+
+class DickeyFullerStudy(OLSViolationStudy):
+    """
+    Investigates the t-statistic of the AR(1) coefficient when the series has a unit root.
+
+    Each simulation is a random walk of `n_samples` steps. Regressing x[t] on
+    x[t-1] (no intercept) and testing phi = 1 gives the Dickey-Fuller tau
+    statistic, whose distribution is skewed to the left of the Student t
+    distribution the usual t-test assumes. The study reports empirical
+    critical values of tau and the size of the naive t-test.
+    """
+
+    _cached_attributes = ("tau", "critical_values", "naive_rejection_rate")
+
+    # Lower-tail probabilities reported in the critical value table.
+    probabilities = (0.01, 0.025, 0.05, 0.10, 0.90, 0.95, 0.975, 0.99)
+
+    def __init__(self, x0=0.05, sigma=0.02, chunk_size=100000, **kwargs):
+        """
+        Args:
+            x0 (float): Starting value of every random walk.
+            sigma (float): Standard deviation of the random walk increments.
+            chunk_size (int): Paths generated and fitted at a time.
+            **kwargs: Forwarded to `OLSViolationStudy`; `n_samples` is the number of steps.
+        """
+        super().__init__(**kwargs)
+        self.x0 = x0
+        self.sigma = sigma
+        self.chunk_size = chunk_size
+
+    @property
+    def params(self):
+        # chunk_size sets the per-chunk random streams, so it changes tau
+        return super().params.replace(x0=self.x0, sigma=self.sigma, chunk_size=self.chunk_size)
+
+    def simulate(self, seed=None):
+        """
+        Simulate `n_simulations` random walks in chunks and compute tau for each,
+        then tabulate the empirical quantiles of tau.
+        """
+        self.tau = np.concatenate([
+            self._tau(np.random.default_rng(chunk_seed), size)
+            for size, chunk_seed in self._chunk_plan(seed, self.chunk_size)
+        ])
+        with self.span("inference", replicates=self.n_simulations):
+            self.critical_values = dict(zip(self.probabilities, np.quantile(self.tau, self.probabilities)))
+            self.naive_rejection_rate = float(np.mean(self._reject_naive(self.tau)))
+
+    def _tau(self, rng, size):
+        with self.span("generate_errors", replicates=size):
+            paths = simulate_random_walks(
+                size, self.n_samples, x0=self.x0, sigma=self.sigma, rng=rng, dtype=self.dtype
+            )
+        with self.span("fit", replicates=size):
+            return dickey_fuller_tau(paths)
+
+    def _reject_naive(self, tau):
+        """Left-tailed 5% test of phi = 1 using the Student t critical value."""
+        # P(T < -t*) = 0.05 where t* is the two-sided 10% critical value
+        return tau < -critical_values(0.10, self.n_samples - 1)
+
+    def _simulate_chunk(self, rng, size):
+        tau = self._tau(rng, size)
+        return {"tau": tau, "reject_naive": self._reject_naive(tau)}
+
+    def _adaptive_targets(self, rate_tol, var_rtol):
+        """Rejection rate of the naive test."""
+        return {"reject_naive": ("rate", rate_tol)}
+
+    def _histogram_edges(self):
+        return {"tau": np.linspace(-6, 4, 101)}
+
+    def critical_value_table(self, sample_sizes, seed=None):
+        """
+        Empirical critical values of tau for several series lengths.
+
+        Args:
+            sample_sizes (sequence): Numbers of steps per random walk.
+            seed (int): Seed used for every series length.
+
+        Returns:
+            np.recarray: One row per series length with a column per entry of
+                `probabilities` ("p0.05", ...) and the naive t-test size.
+        """
+        rows = []
+        for n_samples in sample_sizes:
+            study = DickeyFullerStudy(
+                x0=self.x0,
+                sigma=self.sigma,
+                chunk_size=self.chunk_size,
+                n_simulations=self.n_simulations,
+                n_samples=n_samples,
+                dtype=self.dtype,
+            )
+            study.simulate(seed=seed)
+            rows.append(
+                (n_samples, *study.critical_values.values(), study.naive_rejection_rate)
+            )
+        names = ["n_samples", *(f"p{p}" for p in self.probabilities), "naive_rejection_rate"]
+        return np.rec.fromrecords(rows, names=names)
+
+    def figures(self):
+        if hasattr(self, "tau"):
+            tau = self.histogram("tau", self.tau)
+            critical_value = self.critical_values[0.05]
+        else:
+            # After `simulate_streaming`: the 5% quantile is read off the histogram
+            tau = self.histogram("tau")
+            critical_value = tau.quantile(0.05)
+        return [
+            Figure(
+                self.figure_path("df-statistic"),
+                plot_tau_distribution,
+                dict(tau=tau, df=self.n_samples - 1, critical_value=critical_value),
+            )
+        ]
+
+
+def plot_tau_distribution(tau, df, critical_value):
+    """
+    Histogram of the simulated tau statistics against the Student t density
+    the naive test assumes, with the empirical and nominal 5% critical values.
+    """
+    import matplotlib.pyplot as plt
+    from scipy.stats import t
+    from ..utils.plot_utils import plot_hist
+
+    plt.figure(figsize=(6, 3))
+    plot_hist(tau, 100, density=True, histtype="step", color="C0", label="Dickey-Fuller $\\tau$")
+    x = np.linspace(-5, 5, 200)
+    plt.plot(x, t.pdf(x, df=df), "k--", label=f"$t$-distribution (df={df})")
+    plt.axvline(critical_value, color="C0", linestyle="dotted", label="empirical 5%")
+    plt.axvline(t.ppf(0.05, df=df), color="k", linestyle="dotted", label="nominal 5%")
+    plt.xlim(-6, 4)
+    plt.xlabel("$\\tau$")
+    plt.ylabel("Density")
+    plt.legend()
@@ -1,8 +1,7 @@
 from .base_violation import OLSViolationStudy
+from ..engines import Histogram, fit_wls_batch, normal, uniform
+from ..figures import Figure
 import numpy as np
-import statsmodels.api as sm
-import matplotlib.pyplot as plt
-from ..utils.plot_utils import plot_distribution, plot_residuals, plot_loghist
 
 
 class HomoscedasticityStudy(OLSViolationStudy):
@@ -10,76 +9,144 @@ class HomoscedasticityStudy(OLSViolationStudy):
     Investigates heteroscedasticity in a model where sigma = 0.5 * X.
     """
 
+    true_beta = 2.0
+    _cached_attributes = (
+        "ols_alphas", "ols_betas", "wls_alphas", "wls_betas", "residuals", "X", "Y"
+    )
+
     def simulate(self, seed=None):
         rng = np.random.default_rng(seed=seed)
 
-        self.true_beta = 2.0
-        self.ols_betas = []
-        self.wls_betas = []
-        self.ols_alphas = []
-        self.wls_alphas = []
-        for _ in range(self.n_simulations):
-            X = rng.uniform(1, 5, self.n_samples)
-            X = sm.add_constant(X)
-
-            # Heteroscedastic errors
-            errors = rng.normal(loc=0, scale=0.5 * X[:, 1], size=self.n_samples)
-            Y = self.true_beta * X[:, 1] + errors
-
-            # Fit OLS
-            ols_model = sm.OLS(Y, X).fit()
-            self.ols_alphas.append(ols_model.params[0])
-            self.ols_betas.append(ols_model.params[1])
-
-            # Compute residuals for first dataset
-            if _ == 0:
-                residuals = ols_model.resid
-                self.residuals = residuals
-
-            # Fit WLS
-            weights = 1 / (0.5 * X[:, 1])**2
-            wls_model = sm.WLS(Y, X, weights=weights).fit()
-            self.wls_alphas.append(wls_model.params[0])
-            self.wls_betas.append(wls_model.params[1])
-        
+        with self.span("generate_errors", replicates=self.n_simulations):
+            X, Y, scale = self._draw(rng, self.n_simulations)
+
+        # Fit OLS and WLS to every replicate
+        with self.span("fit", replicates=self.n_simulations):
+            self.ols_alphas, self.ols_betas = fit_wls_batch(X, Y)
+            self.wls_alphas, self.wls_betas = fit_wls_batch(X, Y, weights=1 / scale**2)
+
+        # Compute residuals for first dataset
+        self.residuals = Y[0] - self.ols_alphas[0] - self.ols_betas[0] * X[0]
+
         # Store the last simulated data
-        self.ols_model = ols_model.model
-        self.wls_model = wls_model.model
-        self.X = X
-        self.Y = Y
-
-    def render_plots(self):
-        # First plot: Distribution of beta estimates
-        plt.figure(figsize=(6, 3))
-        plot_loghist(self.ols_betas, 50, label='OLS fit', color='C0', density=True)
-        plot_loghist(self.wls_betas, 50, label='WLS fit', color='C1', density=True)
-        plt.axvline(self.true_beta, label='true', linestyle='dashed', color='red')
-        plt.legend()
-        plt.xlabel("$\\hat{\\beta}$")
-        plt.ylabel("Density")
-        self.save_figure("beta-hist")
-        plt.close()
-
-        # Second plot: Residuals vs X
-        plot_residuals(self.X[:, 1], self.residuals)
-        self.save_figure("resid-vs-x")
-        plt.close()
-
-        # Third plot: WLS Preds, OLS Preds, True trend, Data
-        x = np.linspace(1, 5, 25)
-        X = self.X
-        Y = self.Y
-        ols_pred = self.ols_alphas[-1] + self.ols_betas[-1] * x
-        wls_pred = self.wls_alphas[-1] + self.wls_betas[-1] * x
-        true_trend = self.true_beta * x
-
-        plt.figure(figsize=(6,3))
-        plt.scatter(X[:, 1], Y, alpha=0.3, c='C0', label='Data')
-        plt.plot(x, ols_pred, label=f'OLS $\\hat{{\\beta}} = {self.ols_betas[-1]:.2f}$', linestyle='dashed')
-        plt.plot(x, wls_pred, label=f'WLS $\\hat{{\\beta}} = {self.wls_betas[-1]:.2f}$', linestyle='dashed')
-        plt.plot(x, true_trend, label=f'True $\\hat{{\\beta}} = {self.true_beta:.2f}$', c='black')
-        plt.ylim(1e-1, 13 )
-        plt.xlabel("$x$")
-        plt.ylabel("$y$")
-        plt.legend()
-        self.save_figure("trendlines")
+        self.X = np.column_stack((np.ones(self.n_samples), X[-1]))
+        self.Y = Y[-1]
+
+    def _draw(self, rng, size):
+        """Draw `size` replicates, one per row, returning X, Y and the error scale."""
+        X = uniform(rng, 1, 5, (size, self.n_samples), dtype=self.dtype)
+
+        # Heteroscedastic errors
+        scale = self.dtype.type(0.5) * X
+        errors = normal(rng, scale=scale, dtype=self.dtype)
+        Y = self.true_beta * X + errors
+        return X, Y, scale
+
+    def _simulate_chunk(self, rng, size):
+        X, Y, scale = self._draw(rng, size)
+        ols_alphas, ols_betas = fit_wls_batch(X, Y)
+        wls_alphas, wls_betas = fit_wls_batch(X, Y, weights=1 / scale**2)
+        return {
+            "ols_alpha": ols_alphas,
+            "ols_beta": ols_betas,
+            "wls_alpha": wls_alphas,
+            "wls_beta": wls_betas,
+        }
+
+    def _adaptive_targets(self, rate_tol, var_rtol):
+        """Variances of the OLS and WLS slopes."""
+        return {"ols_beta": ("var", var_rtol), "wls_beta": ("var", var_rtol)}
+
+    def _histogram_edges(self):
+        # Log-symmetric around the true slope
+        edges = Histogram.geometric(self.true_beta / 1.5, self.true_beta * 1.5, 100).edges
+        return {"ols_beta": edges, "wls_beta": edges}
+
+    @property
+    def ols_model(self):
+        """statsmodels OLS model of the last replicate, built on demand."""
+        import statsmodels.api as sm
+        return sm.OLS(self.Y, self.X)
+
+    @property
+    def wls_model(self):
+        """statsmodels WLS model of the last replicate, built on demand."""
+        import statsmodels.api as sm
+        return sm.WLS(self.Y, self.X, weights=1 / (0.5 * self.X[:, 1])**2)
+
+    def figures(self):
+        """
+        The distributions of the OLS and WLS slopes and, unless the study was run
+        with `simulate_streaming`, the residuals and fits of single replicates.
+        """
+        streaming = not hasattr(self, "ols_betas")
+        figures = [
+            Figure(
+                self.figure_path("beta-hist"),
+                plot_beta_histograms,
+                dict(
+                    ols_betas=self.histogram("ols_beta", None if streaming else self.ols_betas),
+                    wls_betas=self.histogram("wls_beta", None if streaming else self.wls_betas),
+                    true_beta=self.true_beta,
+                ),
+            ),
+        ]
+        if streaming:
+            return figures
+        return figures + [
+            Figure(
+                self.figure_path("resid-vs-x"),
+                plot_residuals_vs_x,
+                dict(x=self.X[:, 1], residuals=self.residuals),
+            ),
+            Figure(
+                self.figure_path("trendlines"),
+                plot_trendlines,
+                dict(
+                    x=self.X[:, 1],
+                    y=self.Y,
+                    ols_fit=(self.ols_alphas[-1], self.ols_betas[-1]),
+                    wls_fit=(self.wls_alphas[-1], self.wls_betas[-1]),
+                    true_beta=self.true_beta,
+                ),
+            ),
+        ]
+
+
+def plot_beta_histograms(ols_betas, wls_betas, true_beta):
+    """Distribution of the OLS and WLS slope estimates (arrays or geometric `Histogram`s)."""
+    import matplotlib.pyplot as plt
+    from ..utils.plot_utils import plot_loghist
+
+    plt.figure(figsize=(6, 3))
+    plot_loghist(ols_betas, 50, label='OLS fit', color='C0', density=True)
+    plot_loghist(wls_betas, 50, label='WLS fit', color='C1', density=True)
+    plt.axvline(true_beta, label='true', linestyle='dashed', color='red')
+    plt.legend()
+    plt.xlabel("$\\hat{\\beta}$")
+    plt.ylabel("Density")
+
+
+def plot_residuals_vs_x(x, residuals):
+    """Residuals of the first replicate against the predictor."""
+    from ..utils.plot_utils import plot_residuals
+    plot_residuals(x, residuals)
+
+
+def plot_trendlines(x, y, ols_fit, wls_fit, true_beta):
+    """Data of one replicate with its OLS and WLS fits and the true trend."""
+    import matplotlib.pyplot as plt
+
+    grid = np.linspace(1, 5, 25)
+    ols_alpha, ols_beta = ols_fit
+    wls_alpha, wls_beta = wls_fit
+
+    plt.figure(figsize=(6,3))
+    plt.scatter(x, y, alpha=0.3, c='C0', label='Data')
+    plt.plot(grid, ols_alpha + ols_beta * grid, label=f'OLS $\\hat{{\\beta}} = {ols_beta:.2f}$', linestyle='dashed')
+    plt.plot(grid, wls_alpha + wls_beta * grid, label=f'WLS $\\hat{{\\beta}} = {wls_beta:.2f}$', linestyle='dashed')
+    plt.plot(grid, true_beta * grid, label=f'True $\\hat{{\\beta}} = {true_beta:.2f}$', c='black')
+    plt.ylim(1e-1, 13 )
+    plt.xlabel("$x$")
+    plt.ylabel("$y$")
+    plt.legend()
@@ -0,0 +1,269 @@
+from .base_violation import OLSViolationStudy
+import numpy as np
+
+from ..engines import (
+    condition_numbers, cross_products, normal, solve_normal_equations, variance_inflation_factors,
+)
+from ..figures import Figure
+
+
+class MulticollinearityStudy(OLSViolationStudy):
+    """
+    Investigates how correlated predictors inflate the variance of OLS coefficients.
+
+    Each replicate draws p predictors with equicorrelation rho,
+
+        x_j = sqrt(1 - rho) * z_j + sqrt(rho) * w,
+
+    from independent standard normals z_j and a common factor w, and fits
+    y = sum_j x_j + e, e ~ N(0, sigma^2), with an intercept. The population
+    variance inflation factor of every predictor is
+
+        VIF = (1 + (p - 2) rho) / ((1 - rho) (1 + (p - 1) rho)),
+
+    and the exact variance of each slope is sigma^2 VIF / (n_samples - p - 2).
+
+    The expensive part of a fit, the Gram matrix, is not recomputed per grid
+    point: the centered cross-products of [z_1..z_pmax, w, e] are formed once
+    per replicate, the Gram matrix for any rho is a rank-two update of the z
+    block, and the design for p predictors is the leading p x p block. Every
+    (rho, p) cell is then solved by batched Cholesky factorizations on the
+    stacked (n_simulations, p, p) Gram matrices.
+    """
+
+    _cached_attributes = ("replicates", "results")
+
+    def __init__(
+        self,
+        correlations=(0.0, 0.5, 0.9, 0.99),
+        n_predictors=(2, 5, 10, 25, 50),
+        sigma=1.0,
+        chunk_size=1000,
+        **kwargs,
+    ):
+        """
+        Args:
+            correlations (sequence): Pairwise predictor correlations rho in [0, 1).
+            n_predictors (sequence): Numbers of predictors p, each below n_samples - 2.
+            sigma (float): Standard deviation of the regression errors.
+            chunk_size (int): Replicates simulated and fitted at a time.
+            **kwargs: Forwarded to `OLSViolationStudy`.
+        """
+        super().__init__(**kwargs)
+        self.correlations = list(correlations)
+        self.n_predictors = sorted(n_predictors)
+        self.sigma = sigma
+        self.chunk_size = chunk_size
+        if not all(0 <= rho < 1 for rho in self.correlations):
+            raise ValueError(f"correlations must lie in [0, 1), got {self.correlations}.")
+        if self.n_predictors[-1] > self.n_samples - 3:
+            raise ValueError(
+                f"n_predictors up to {self.n_predictors[-1]} needs n_samples >= "
+                f"{self.n_predictors[-1] + 3}, got {self.n_samples}."
+            )
+
+    @property
+    def params(self):
+        # chunk_size sets the per-chunk random streams, so it changes the draws
+        return super().params.replace(
+            correlations=self.correlations,
+            n_predictors=self.n_predictors,
+            sigma=self.sigma,
+            chunk_size=self.chunk_size,
+        )
+
+    @staticmethod
+    def expected_vif(rho, p):
+        """Population VIF of every predictor under equicorrelation rho."""
+        return (1 + (p - 2) * rho) / ((1 - rho) * (1 + (p - 1) * rho))
+
+    def expected_beta_var(self, rho, p):
+        """Exact variance of each OLS slope, sigma^2 E[(X'X)^-1_jj]."""
+        return self.sigma**2 * self.expected_vif(rho, p) / (self.n_samples - p - 2)
+
+    @staticmethod
+    def population_condition_number(rho, p):
+        """Condition number of the population design, sqrt of that of the correlation matrix."""
+        return np.sqrt((1 + (p - 1) * rho) / (1 - rho))
+
+    def simulate(self, seed=None):
+        """
+        Simulate `n_simulations` replicates in chunks and fit every (rho, p)
+        cell, then tabulate empirical against theoretical variance inflation.
+        """
+        chunks = [
+            self._simulate_chunk(np.random.default_rng(chunk_seed), size)
+            for size, chunk_seed in self._chunk_plan(seed, self.chunk_size)
+        ]
+        self.replicates = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+        with self.span("inference", replicates=self.n_simulations):
+            self.results = self.inflation_table()
+
+    def _simulate_chunk(self, rng, size):
+        """
+        Per-replicate quantities named "<rho>/<p>/<quantity>":
+          - beta: estimate of the first slope (true value 1),
+          - beta_var_hat: its estimated variance s^2 (X'X)^-1_11,
+          - vif: sample VIF averaged over the p predictors,
+          - condition_number: of the standardized design.
+        """
+        p_max = self.n_predictors[-1]
+        with self.span("generate_errors", replicates=size):
+            data = normal(rng, size=(size, self.n_samples, p_max + 2), dtype=self.dtype)
+            data[:, :, -1] *= self.sigma
+
+        with self.span("fit", replicates=size):
+            # Columns: z_1..z_pmax, w, e
+            s = cross_products(data)
+            s_zz = s[:, :p_max, :p_max]
+            s_zw = s[:, :p_max, p_max]
+            s_ze = s[:, :p_max, p_max + 1]
+            s_ww = s[:, p_max, p_max]
+            s_we = s[:, p_max, p_max + 1]
+            s_ee = s[:, p_max + 1, p_max + 1]
+
+            chunk = {}
+            for rho in self.correlations:
+                a, b = np.sqrt(1 - rho), np.sqrt(rho)
+                for p in self.n_predictors:
+                    ones = np.ones(p)
+                    zw = s_zw[:, :p]
+                    gram = (
+                        a**2 * s_zz[:, :p, :p]
+                        + a * b * (zw[:, :, None] * ones + ones[:, None] * zw[:, None, :])
+                        + b**2 * s_ww[:, None, None] * np.ones((p, p))
+                    )
+                    # X'e; with all slopes equal to one, beta_hat - 1 = (X'X)^-1 X'e
+                    xte = a * s_ze[:, :p] + b * s_we[:, None]
+                    delta, ssr, inv_diag = solve_normal_equations(gram, xte, s_ee)
+                    s2 = ssr / (self.n_samples - p - 1)
+
+                    name = f"{rho}/{p}"
+                    chunk[f"{name}/beta"] = 1 + delta[:, 0]
+                    chunk[f"{name}/beta_var_hat"] = s2 * inv_diag[:, 0]
+                    chunk[f"{name}/vif"] = variance_inflation_factors(gram, inv_diag).mean(axis=1)
+                    chunk[f"{name}/condition_number"] = condition_numbers(gram)
+        return chunk
+
+    def _adaptive_targets(self, rate_tol, var_rtol):
+        """Variance of the first slope per (ρ, p) cell."""
+        return {
+            f"{rho}/{p}/beta": ("var", var_rtol) for rho in self.correlations for p in self.n_predictors
+        }
+
+    def _histogram_edges(self):
+        """
+        400 log-spaced bins per cell for the condition numbers, from 1 to 10^4
+        times the population value, so their median is available after streaming.
+        """
+        return {
+            f"{rho}/{p}/condition_number": np.geomspace(1, 1e4 * self.population_condition_number(rho, p), 401)
+            for rho in self.correlations
+            for p in self.n_predictors
+        }
+
+    def inflation_table(self):
+        """
+        Empirical against theoretical variance inflation per (rho, p) cell.
+
+        Computed from the replicates of `simulate` or, after `simulate_streaming`
+        or `simulate_adaptive`, from the streaming summary, with the median
+        condition number read off its histogram.
+
+        Returns:
+            np.recarray: One row per cell with the correlation, the number of
+                predictors, the mean sample VIF and the population VIF, the
+                variance of the first slope across replicates, its exact value
+                and the mean estimated variance, the ratio of the slope
+                variance to that of uncorrelated predictors, and the median
+                sample and the population condition numbers.
+        """
+        rows = []
+        for rho in self.correlations:
+            for p in self.n_predictors:
+                name = f"{rho}/{p}"
+                if hasattr(self, "replicates"):
+                    mean_vif = np.mean(self.replicates[f"{name}/vif"])
+                    beta_var = np.var(self.replicates[f"{name}/beta"], ddof=1)
+                    mean_beta_var_hat = np.mean(self.replicates[f"{name}/beta_var_hat"])
+                    median_condition_number = np.median(self.replicates[f"{name}/condition_number"])
+                else:
+                    moments = self.summary.moments
+                    mean_vif = moments[f"{name}/vif"].mean
+                    beta_var = moments[f"{name}/beta"].variance
+                    mean_beta_var_hat = moments[f"{name}/beta_var_hat"].mean
+                    median_condition_number = self.histogram(f"{name}/condition_number").quantile(0.5)
+                rows.append((
+                    rho,
+                    p,
+                    mean_vif,
+                    self.expected_vif(rho, p),
+                    beta_var,
+                    self.expected_beta_var(rho, p),
+                    mean_beta_var_hat,
+                    beta_var / self.expected_beta_var(0.0, p),
+                    median_condition_number,
+                    self.population_condition_number(rho, p),
+                ))
+        names = [
+            "correlation", "n_predictors", "mean_vif", "expected_vif", "beta_var",
+            "expected_beta_var", "mean_beta_var_hat", "variance_inflation",
+            "median_condition_number", "population_condition_number",
+        ]
+        return np.rec.fromrecords(rows, names=names)
+
+    def figures(self):
+        # After `simulate_streaming` or `simulate_adaptive` the table comes from the summary
+        results = self.results if hasattr(self, "results") else self.inflation_table()
+        return [
+            Figure(
+                self.figure_path("variance-inflation"),
+                plot_variance_inflation,
+                dict(
+                    correlation=results["correlation"],
+                    n_predictors=results["n_predictors"],
+                    variance_inflation=results["variance_inflation"],
+                    expected_vif=results["expected_vif"],
+                ),
+            ),
+            Figure(
+                self.figure_path("condition-numbers"),
+                plot_condition_numbers,
+                dict(
+                    correlation=results["correlation"],
+                    n_predictors=results["n_predictors"],
+                    median_condition_number=results["median_condition_number"],
+                    population_condition_number=results["population_condition_number"],
+                ),
+            ),
+        ]
+
+
+def plot_variance_inflation(correlation, n_predictors, variance_inflation, expected_vif):
+    """Slope variance relative to uncorrelated predictors (markers) against the population VIF (lines)."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6, 3))
+    for i, p in enumerate(np.unique(n_predictors)):
+        cell = n_predictors == p
+        plt.plot(correlation[cell], expected_vif[cell], color=f"C{i}", linestyle="dashed")
+        plt.plot(correlation[cell], variance_inflation[cell], "o", color=f"C{i}", label=f"$p = {p}$")
+    plt.yscale("log")
+    plt.xlabel("predictor correlation $\\rho$")
+    plt.ylabel("Var$(\\hat{\\beta}_1)$ inflation")
+    plt.legend()
+
+
+def plot_condition_numbers(correlation, n_predictors, median_condition_number, population_condition_number):
+    """Median sample condition number (markers) against the population value (lines)."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6, 3))
+    for i, p in enumerate(np.unique(n_predictors)):
+        cell = n_predictors == p
+        plt.plot(correlation[cell], population_condition_number[cell], color=f"C{i}", linestyle="dashed")
+        plt.plot(correlation[cell], median_condition_number[cell], "o", color=f"C{i}", label=f"$p = {p}$")
+    plt.yscale("log")
+    plt.xlabel("predictor correlation $\\rho$")
+    plt.ylabel("condition number $\\kappa$")
+    plt.legend()
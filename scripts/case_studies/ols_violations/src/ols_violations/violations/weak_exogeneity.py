@@ -0,0 +1,230 @@
+from .base_violation import OLSViolationStudy
+import numpy as np
+
+from ..engines import fit_ols_noisy_predictor, normal
+from ..figures import Figure
+
+
+class WeakExogeneityStudy(OLSViolationStudy):
+    """
+    Investigates the attenuation of the OLS slope when the predictor is measured with error.
+
+    The true model is y = beta * x + e with x ~ N(0, sigma_x^2) and
+    e ~ N(0, sigma_e^2), but only x + eta is observed, with
+    eta ~ N(0, (tau * sigma_x)^2) for a noise ratio tau. The OLS slope of y on
+    the observed predictor is then centered on lambda * beta, where
+
+        lambda = 1 / (1 + tau^2)
+
+    is the reliability ratio. Because (x + eta, y) is jointly normal this holds
+    exactly in finite samples, and the slope variance is
+    sigma_u^2 / (sigma_obs^2 * (n_samples - 3)) with
+    sigma_u^2 = beta^2 sigma_x^2 (1 - lambda) + sigma_e^2 and
+    sigma_obs^2 = sigma_x^2 (1 + tau^2).
+
+    All noise ratios share the same draws of x, e and the standardized noise
+    (common random numbers), and their slopes are obtained in a single pass
+    with `fit_ols_noisy_predictor`.
+    """
+
+    true_beta = 2.5
+    _cached_attributes = ("betas", "results")
+
+    def __init__(
+        self,
+        noise_ratios=(0.0, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0),
+        sigma_x=1.0,
+        sigma_e=0.5,
+        chunk_size=20000,
+        z=4.0,
+        **kwargs,
+    ):
+        """
+        Args:
+            noise_ratios (sequence): Ratios tau of the measurement error to the
+                predictor standard deviation.
+            sigma_x (float): Standard deviation of the true predictor.
+            sigma_e (float): Standard deviation of the regression errors.
+            chunk_size (int): Replicates simulated and fitted at a time.
+            z (float): Number of Monte Carlo standard errors within which the
+                mean slope must match lambda * beta for the check to pass.
+            **kwargs: Forwarded to `OLSViolationStudy`; `n_simulations`
+                defaults to one million.
+        """
+        kwargs.setdefault("n_simulations", 1_000_000)
+        super().__init__(**kwargs)
+        self.noise_ratios = list(noise_ratios)
+        self.sigma_x = sigma_x
+        self.sigma_e = sigma_e
+        self.chunk_size = chunk_size
+        self.z = z
+
+    @property
+    def params(self):
+        # chunk_size sets the per-chunk random streams and z the cached pass/fail flags
+        return super().params.replace(
+            noise_ratios=self.noise_ratios,
+            sigma_x=self.sigma_x,
+            sigma_e=self.sigma_e,
+            chunk_size=self.chunk_size,
+            z=self.z,
+        )
+
+    @property
+    def reliability(self):
+        """Theoretical reliability ratio lambda for every noise ratio."""
+        return 1 / (1 + np.asarray(self.noise_ratios, dtype=float) ** 2)
+
+    def expected_beta_var(self):
+        """Exact finite-sample variance of the OLS slope for every noise ratio."""
+        reliability = self.reliability
+        var_u = self.true_beta**2 * self.sigma_x**2 * (1 - reliability) + self.sigma_e**2
+        var_obs = self.sigma_x**2 / reliability
+        return var_u / (var_obs * (self.n_samples - 3))
+
+    def simulate(self, seed=None):
+        """
+        Simulate `n_simulations` replicates in chunks, fit every noise ratio and
+        compare the slopes with the theoretical attenuation.
+        """
+        self.betas = np.concatenate([
+            self._slopes(np.random.default_rng(chunk_seed), size)
+            for size, chunk_seed in self._chunk_plan(seed, self.chunk_size)
+        ])
+        with self.span("inference", replicates=self.n_simulations):
+            self.results = self.attenuation_table(self.betas)
+
+    def _slopes(self, rng, size):
+        """Slopes of shape (size, n_noise_ratios) from one set of draws."""
+        shape = (size, self.n_samples)
+        with self.span("generate_errors", replicates=size):
+            x = normal(rng, scale=self.sigma_x, size=shape, dtype=self.dtype)
+            e = normal(rng, scale=self.sigma_e, size=shape, dtype=self.dtype)
+            z = normal(rng, size=shape, dtype=self.dtype)
+            y = self.true_beta * x + e
+        with self.span("fit", replicates=size):
+            return fit_ols_noisy_predictor(x, z, y, self.sigma_x * np.asarray(self.noise_ratios))
+
+    def attenuation_table(self, betas):
+        """
+        Empirical against theoretical attenuation per noise ratio.
+
+        Args:
+            betas (np.ndarray): Slopes of shape (n_simulations, n_noise_ratios).
+
+        Returns:
+            np.recarray: One row per noise ratio with the reliability ratio, the
+                mean slope and its Monte Carlo standard error, the expected slope
+                lambda * beta, the z-score of their difference, whether it lies
+                within `z`, and the empirical and expected slope variances.
+        """
+        n = betas.shape[0]
+        mean_beta = betas.mean(axis=0)
+        beta_var = betas.var(axis=0, ddof=1)
+        mcse = np.sqrt(beta_var / n)
+        expected_beta = self.reliability * self.true_beta
+        z_score = (mean_beta - expected_beta) / mcse
+        return np.rec.fromarrays(
+            [
+                np.asarray(self.noise_ratios, dtype=float),
+                self.reliability,
+                mean_beta,
+                mcse,
+                expected_beta,
+                z_score,
+                np.abs(z_score) < self.z,
+                beta_var,
+                self.expected_beta_var(),
+            ],
+            names=[
+                "noise_ratio", "reliability", "mean_beta", "mcse", "expected_beta",
+                "z_score", "ok", "beta_var", "expected_beta_var",
+            ],
+        )
+
+    def _simulate_chunk(self, rng, size):
+        betas = self._slopes(rng, size)
+        return {f"{tau}/beta": betas[:, i] for i, tau in enumerate(self.noise_ratios)}
+
+    def _adaptive_targets(self, rate_tol, var_rtol):
+        """Slope variance per noise ratio."""
+        return {f"{tau}/beta": ("var", var_rtol) for tau in self.noise_ratios}
+
+    def _histogram_edges(self):
+        """100 bins spanning ±5 theoretical standard deviations around lambda * beta."""
+        centers = self.reliability * self.true_beta
+        half_widths = 5 * np.sqrt(self.expected_beta_var())
+        return {
+            f"{tau}/beta": np.linspace(center - half_width, center + half_width, 101)
+            for tau, center, half_width in zip(self.noise_ratios, centers, half_widths)
+        }
+
+    def figures(self):
+        """
+        The empirical attenuation against the reliability ratio, and the slope
+        distributions per noise ratio. After `simulate_streaming` both are
+        drawn from the streaming summary.
+        """
+        names = [f"{tau}/beta" for tau in self.noise_ratios]
+        if hasattr(self, "betas"):
+            histograms = [self.histogram(name, self.betas[:, i]) for i, name in enumerate(names)]
+            mean_beta, mcse = self.results["mean_beta"], self.results["mcse"]
+        else:
+            histograms = [self.histogram(name) for name in names]
+            moments = [self.summary.moments[name] for name in names]
+            mean_beta = np.array([m.mean for m in moments])
+            mcse = np.array([m.std / np.sqrt(m.count) for m in moments])
+
+        return [
+            Figure(
+                self.figure_path("attenuation"),
+                plot_attenuation,
+                dict(
+                    noise_ratios=self.noise_ratios,
+                    attenuation=mean_beta / self.true_beta,
+                    attenuation_se=mcse / self.true_beta,
+                ),
+            ),
+            Figure(
+                self.figure_path("beta-hist"),
+                plot_slope_histograms,
+                dict(
+                    noise_ratios=self.noise_ratios,
+                    histograms=histograms,
+                    expected_beta=self.reliability * self.true_beta,
+                    true_beta=self.true_beta,
+                ),
+            ),
+        ]
+
+
+def plot_attenuation(noise_ratios, attenuation, attenuation_se):
+    """Mean slope relative to the true slope against the reliability ratio 1 / (1 + tau^2)."""
+    import matplotlib.pyplot as plt
+
+    tau = np.linspace(0, max(noise_ratios), 200)
+    plt.figure(figsize=(6, 3))
+    plt.plot(tau, 1 / (1 + tau**2), "k--", label="reliability ratio $\\lambda$")
+    plt.errorbar(
+        noise_ratios, attenuation, yerr=2 * np.asarray(attenuation_se),
+        fmt="o", color="C0", label="simulated $E[\\hat{\\beta}] / \\beta$",
+    )
+    plt.ylim(0, 1.05)
+    plt.xlabel("noise ratio $\\sigma_\\eta / \\sigma_x$")
+    plt.ylabel("attenuation")
+    plt.legend()
+
+
+def plot_slope_histograms(noise_ratios, histograms, expected_beta, true_beta):
+    """Slope distribution per noise ratio, each with its theoretical center lambda * beta."""
+    import matplotlib.pyplot as plt
+    from ..utils.plot_utils import plot_hist
+
+    plt.figure(figsize=(6, 3))
+    for i, (tau, histogram) in enumerate(zip(noise_ratios, histograms)):
+        plot_hist(histogram, density=True, histtype="step", color=f"C{i}", label=f"$\\tau = {tau}$")
+        plt.axvline(expected_beta[i], color=f"C{i}", linestyle="dotted")
+    plt.axvline(true_beta, color="k", linestyle="dashed", label="true $\\beta$")
+    plt.xlabel("$\\hat{\\beta}$")
+    plt.ylabel("Density")
+    plt.legend(fontsize="small")
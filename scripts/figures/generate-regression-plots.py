@@ -1,16 +1,15 @@
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
 from pathlib import Path
 
-# Global constants and settings
-OUT_PATH = Path('../../src/')
-plt.style.use('axion')  
-plt.rcParams['figure.figsize'] = (6, 3)
+sys.path.insert(0, str(Path(__file__).parents[1] / "case_studies/ols_violations/src"))
+from ols_violations.engines import linear_fit
+from ols_violations.figures import Figure, build_figures
 
-def _check_1d(arr):
-    """Check if array is 1-dimensional."""
-    return len(arr.shape) == 1
+# Global constants and settings
+OUT_PATH = Path(__file__).parents[2] / 'src'
+FIGURE_MANIFEST = Path(__file__).parents[1] / '.simulation_cache' / 'regression-plots.json'
+SEED = 12345
 
 def filepath(subdir, filename):
     """Generates the full file path for saving plots, creating directories if necessary."""
@@ -26,64 +25,38 @@ def set_xy_labels(ax, x_label="X", y_label="Y"):
     ax.set_xlabel(f"${x_label}$")
     ax.set_ylabel(f"${y_label}$")
 
-class LinearModel:
-    """Wrapper around sklearn's LinearRegression model."""
-    def __init__(self, **model_kwargs):
-        """
-        Initialize the LinearRegression model with any additional keyword arguments,
-        e.g. LinearModel(fit_intercept=False, etc.).
-        """
-        self.model = LinearRegression(**model_kwargs)
-
-    def fit(self, x, y, **kwargs):
-        """
-        Fit the linear model to the data, passing any keyword arguments
-        (like `sample_weight`) to .fit() directly.
-        """
-        x = x.reshape(-1, 1) if _check_1d(x) else x
-        self.model.fit(x, y, **kwargs)
-
-    def predict(self, x):
-        """Predict using the fitted model."""
-        x = x.reshape(-1, 1) if _check_1d(x) else x
-        return self.model.predict(x)
-
-def linear_fit(x, y, **kwargs):
-    """
-    Convenient wrapper to:
-    1. create a LinearModel,
-    2. fit it on (x, y) with all keyword arguments passed to .fit().
-
-    Examples of kwargs: sample_weight, etc.
-    """
-    model = LinearModel()
-    model.fit(x, y, **kwargs)
-    return model
+# Weak exogeneity violation (Errors in Variables)
+def simulate_weak_exogeneity(seed=None):
+    """Simulates data with measurement error in x and fits a line to it."""
+    rng = np.random.default_rng(seed)
 
-# Function to simulate and plot weak exogeneity violation (Errors in Variables)
-def render_weak_exogeneity(subdir, filename):
-    """Generates a plot to demonstrate weak exogeneity violation."""
-    
     # Simulating data (true x, y) with a linear relationship
     n = 100
-    true_x = np.random.normal(size=n)
-    true_y = 2.5 * true_x + np.random.normal(scale=0.5, size=n)  # y = 2.5 * x + error
-    
+    true_x = rng.normal(size=n)
+    true_y = 2.5 * true_x + rng.normal(scale=0.5, size=n)  # y = 2.5 * x + error
+
     # Introduce measurement error in x
-    eta = np.random.normal(scale=0.5, size=n)  # Measurement error
+    eta = rng.normal(scale=0.5, size=n)  # Measurement error
     observed_x = true_x + eta  # Observed x with error
-    
-    # Fit linear model on true data (no errors in x)
-    model_true = linear_fit(true_x, true_y)
-    pred_true = model_true.predict(true_x)
-    
+
     # Fit linear model on observed data (with errors in x)
     x = np.linspace(true_x.min(), true_x.max(), 25)
     model_observed = linear_fit(observed_x, true_y)
-    pred_observed = model_observed.predict(x)
 
-    # Plotting the results
-    fig, ax = plt.subplots()
+    return dict(
+        true_x=true_x,
+        true_y=true_y,
+        observed_x=observed_x,
+        x=x,
+        pred_observed=model_observed.predict(x),
+    )
+
+
+def plot_weak_exogeneity(true_x, true_y, observed_x, x, pred_observed):
+    """Plots the true and the error-prone data with the fitted and the true model."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 3))
     
     ax.scatter(true_x, true_y, label='true data', alpha=0.2, color='C1', s=3)
     ax.plot(x, 2.5 * x, label='true model', linestyle='--', color='C1')
@@ -92,30 +65,28 @@ def render_weak_exogeneity(subdir, filename):
     ax.plot(x, pred_observed, label='fitted model', linestyle='--', color='C0')
     
     # Use helper function to set labels consistently
-    set_xy_labels(ax, x_label="$x$", y_label="$y$")
+    set_xy_labels(ax, x_label="x", y_label="y")
     ax.legend()
-    
-    # Save and show
-    plt.savefig(filepath(subdir=subdir, filename=filename), bbox_inches='tight')
-    plt.show()
 
-# Function to simulate and plot heteroscedasticity violation
-def render_heteroscedasticity(subdir, filename):
+
+# Heteroscedasticity violation
+def simulate_heteroscedasticity(seed=None):
     """
-    Demonstrate heteroscedasticity where errors' scale is drawn from a scaled chi-square 
-    distribution with mean=1 and variance=0.25, ensuring positivity.
-    We'll compare standard OLS vs. weighted OLS (WLS).
+    Simulates heteroscedasticity where errors' scale is drawn from a scaled chi-square 
+    distribution, ensuring positivity, and fits standard OLS and weighted OLS (WLS).
     """
+    rng = np.random.default_rng(seed)
+
     n = 100
-    x = np.random.normal(0, 1, size=n)
+    x = rng.normal(0, 1, size=n)
 
     # Chi-square parameters (k=8, alpha=0.125) => E[sigma]=1, Var(sigma)=0.25, sigma>0
     k = 8
     alpha = 2.0
-    sigma = alpha * np.random.chisquare(k, size=n)
+    sigma = alpha * rng.chisquare(k, size=n)
 
     # True relationship: y = 2*x + noise, where noise ~ Normal(0, sigma_i)
-    y = 2.0 * x + np.random.normal(scale=sigma, size=n)
+    y = 2.0 * x + rng.normal(scale=sigma, size=n)
 
     # Fit OLS (no weights)
     model_ols = linear_fit(x, y)
@@ -126,25 +97,45 @@ def render_heteroscedasticity(subdir, filename):
 
     # Create a sparser domain of x-values for prediction
     domain_x = np.linspace(x.min(), x.max(), 25)
-    pred_ols = model_ols.predict(domain_x)
-    pred_wls = model_wls.predict(domain_x)
 
-    # Plot
-    fig, ax = plt.subplots()
+    return dict(
+        x=x,
+        y=y,
+        domain_x=domain_x,
+        pred_ols=model_ols.predict(domain_x),
+        pred_wls=model_wls.predict(domain_x),
+    )
+
+
+def plot_heteroscedasticity(x, y, domain_x, pred_ols, pred_wls):
+    """Plots the heteroscedastic data with the OLS and WLS fits."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 3))
 
     ax.scatter(x, y, label='data', alpha=0.5, color='C0', s=3)
     ax.plot(domain_x, pred_ols, label='OLS fit', linestyle='--', color='C0')
     ax.plot(domain_x, pred_wls, label='WLS fit', linestyle='--', color='C1')
 
     # Use helper to set lower-case axis labels
-    set_xy_labels(ax, x_label="$x$", y_label="$y$")
+    set_xy_labels(ax, x_label="x", y_label="y")
 
     ax.legend()
-    plt.savefig(filepath(subdir, filename), bbox_inches='tight')
-    plt.show()
 
 
 if __name__ == '__main__':
-    render_weak_exogeneity(subdir="broken-assumptions/figs", filename="weak_exogeneity_example.svg")
-    render_heteroscedasticity(subdir="broken-assumptions/figs", filename="heteroscedasticity_example.svg")
-
+    # Data are simulated here; each figure is rendered in its own process and
+    # only when its data or plotting code changed since the last run.
+    figures = [
+        Figure(
+            filepath("broken-assumptions/figs", "weak_exogeneity_example.svg"),
+            plot_weak_exogeneity,
+            simulate_weak_exogeneity(seed=SEED),
+        ),
+        Figure(
+            filepath("broken-assumptions/figs", "heteroscedasticity_example.svg"),
+            plot_heteroscedasticity,
+            simulate_heteroscedasticity(seed=SEED),
+        ),
+    ]
+    build_figures(figures, manifest=FIGURE_MANIFEST)
@@ -1,27 +1,24 @@
 import sys
 from pathlib import Path
-abs_path = Path(__file__).parent / "case_studies/ols_violations/ols_violations"
-print("exists", (abs_path / "violations").exists())
+abs_path = Path(__file__).parent / "case_studies/ols_violations/src"
+print("exists", (abs_path / "ols_violations" / "violations").exists())
 print(f"Module Path {abs_path}")
 sys.path.insert(0, str(abs_path))
 
-import matplotlib.pyplot as plt
-if 'axion' in plt.style.available:
-    plt.style.use('axion')
+from ols_violations.parallel import run_studies
+from ols_violations.violations import HomoscedasticityStudy, AutocorrelationStudy, WeakExogeneityStudy
 
-from violations import HomoscedasticityStudy, AutocorrelationStudy
-
-def render(s):
-    "Wrapper that runs simulation and renders a plot"
-    study = s()
-    study.simulate(seed=12345)
-    study.render_plots()
+CACHE_DIR = Path(__file__).parent / ".simulation_cache"
+FIGURE_MANIFEST = CACHE_DIR / "figures.json"
 
 if __name__ == '__main__':
     
     studies = [
         AutocorrelationStudy,
+        WeakExogeneityStudy,
     ]
 
-    for study in studies:
-        render(study)
+    # Each study runs in its own process with the same seed it would get serially.
+    # Simulation results are cached, so restyling a figure skips the simulation.
+    # Figures are rendered in parallel and only when their inputs or plotting code changed.
+    run_studies(studies, seed=12345, render=True, cache_dir=CACHE_DIR, manifest=FIGURE_MANIFEST)